@@ -24,17 +24,27 @@ def is_valid_japanese_char(ch: str) -> bool:
     return False
 
 
+_valid_char_cache = {}
+
+
 def extract_substrings_from_sentence(sentence: str, results: set):
     length = len(sentence)
 
+    # classify each character once (unicodedata.name is slow, and characters
+    # repeat across the corpus) instead of once per substring it ends
+    valid = []
+    for ch in sentence:
+        ok = _valid_char_cache.get(ch)
+        if ok is None:
+            ok = _valid_char_cache[ch] = is_valid_japanese_char(ch)
+        valid.append(ok)
+
     for start in range(length):
-        if not is_valid_japanese_char(sentence[start]):
+        if not valid[start]:
             continue
 
         for end in range(start + 1, min(start + MAX_LEN, length) + 1):
-            ch = sentence[end - 1]
-
-            if not is_valid_japanese_char(ch):
+            if not valid[end - 1]:
                 break
 
             if end - start >= MIN_LEN:
@@ -90,9 +100,11 @@ def main():
 
     print("Writing output...")
 
+    # one join and one write instead of a concat + write() per substring
     with output_path.open("w", encoding="utf-8") as f:
-        for s in results:
-            f.write(s + "\n")
+        if results:
+            f.write("\n".join(results))
+            f.write("\n")
 
     total_time = time.time() - stats["start_time"]
     print(
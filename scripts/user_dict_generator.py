@@ -14,6 +14,12 @@ from .WriteUserDictionaryFile import WriteUserDictionaryFile
 
 RE_ALL_HIRAGANA = re.compile(r"^[ぁ-んー]+$")
 
+WRITE_BATCH_SIZE = 1024
+# Dictionary rows are collected and handed to writerows() this many at a time
+
+WRITE_BUFFER_SIZE = 1 << 20
+# Output file buffer, so each batch reaches the disk in a few large writes
+
 JMDICT_TO_SUDACHI_POS = {
     # ---- Nouns ----
     "noun (common) (futsuumeishi)": ("名詞", "普通名詞", "一般", "*"),
@@ -125,10 +131,11 @@ def main():
 
     with (
         TemporaryDirectory() as tmpdir_str,
-        open(output_file, "w", newline="", encoding="utf-8") as f
+        open(output_file, "w", newline="", encoding="utf-8", buffering=WRITE_BUFFER_SIZE) as f
     ):
         tmpdir = Path(tmpdir_str)
         writer = csv.writer(f)
+        rows = []
         invalid = 0
 
         # --- create a callback closure that has access to writer ---
@@ -196,7 +203,11 @@ def main():
                 "*"            # 17 未使用
             ]
 
-            writer.writerow(row)
+            rows.append(row)
+
+            if len(rows) >= WRITE_BATCH_SIZE:
+                writer.writerows(rows)
+                rows.clear()
 
         steps = [
             AddDictionaryEntries(on_entry_processed=on_entry_processed_callback)
@@ -205,6 +216,8 @@ def main():
         pipeline = Pipeline(steps=steps, on_progress=print_step_progress)
         pipeline.run(Artifact(word_data, tmpdir=tmpdir))
 
+        writer.writerows(rows)
+
     print(f'User dictionary generated. {invalid} invalid entries skipped')
 
 
@@ -281,21 +294,24 @@ def resolve_sudachi_pos(jmdict_pos_list):
     return candidates[0]
 
 
+# Built once; print_step_progress runs on every progress event
+STEP_TEXT = {
+    ProcessingStep.FILTERING: "Filtering definition candidates",
+    ProcessingStep.DEFINITIONS: "Adding definitions"
+}
+
 def print_step_progress(step, amount, total, additional_text=""):
     if step is None:
         print(additional_text)
         return
 
-    step_text = {
-        step.FILTERING: "Filtering definition candidates",
-        step.DEFINITIONS: "Adding definitions"
-    }
+    text = STEP_TEXT[step]
 
     if amount >= total:
-        print(f"{step_text[step]}... done. {additional_text}\n", flush=True)
+        print(f"{text}... done. {additional_text}\n", flush=True)
     elif (amount % 5000) == 0:
         percent = f"{amount / total:.1%}"
-        print(f"{step_text[step]}... {percent} {additional_text}", end="\r", flush=True)
+        print(f"{text}... {percent} {additional_text}", end="\r", flush=True)
 
 
 if __name__ == "__main__":
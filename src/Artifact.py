@@ -7,5 +7,4 @@ from typing import Any, Optional
 class Artifact:
     data: Any
     tmpdir: Optional[Path] = None
-    is_path: bool = True
     sentences: list = field(default_factory=list)
\ No newline at end of file
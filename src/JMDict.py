@@ -1,5 +1,4 @@
 import xml.etree.ElementTree as ET
-import re
 
 from pathlib import Path
 from typing import List, Dict
@@ -17,7 +16,28 @@ PRI_BONUS = {
     "gai2": 50,
 }
 
-KANA_RE = re.compile(r"[ぁ-んァ-ンー]+")
+# JMdict only uses a few dozen distinct priority tags, so each one is
+# parsed and scored once and looked up afterwards
+_pri_tag_scores = {}
+
+
+def _score_pri_tag(tag):
+    if tag.startswith("nf"):
+        try:
+            return (49 - int(tag[2:])) * 100
+        except ValueError:
+            return 0
+    return PRI_BONUS.get(tag, 0)
+
+
+def _score_pri_tags(tags):
+    score = 0
+    for tag in tags:
+        tag_score = _pri_tag_scores.get(tag)
+        if tag_score is None:
+            tag_score = _pri_tag_scores[tag] = _score_pri_tag(tag)
+        score += tag_score
+    return score
 
 
 class JMDict:
@@ -26,15 +46,25 @@ class JMDict:
         self.tree = ET.parse(self.xml_path)
         self.root = self.tree.getroot()
         self.index = {}
+        self._parsed = {}
         self._build_index()
 
     def _build_index(self):
-        for entry in self.root.findall("entry"):
-            entry_data = self._parse_entry(entry)
-            for k in entry_data["kanji"]:
-                self.index.setdefault(k["form"], []).append(entry_data)
-            for r in entry_data["reading"]:
-                self.index.setdefault(r["form"], []).append(entry_data)
+        # Only the headword forms are read up front; an entry's full
+        # structure is parsed the first time one of its forms is looked up,
+        # so a run pays for the words it mines instead of all of JMdict
+        index = self.index
+        for entry in self.root.iterfind("entry"):
+            for keb in entry.iterfind("k_ele/keb"):
+                index.setdefault(keb.text, []).append(entry)
+            for reb in entry.iterfind("r_ele/reb"):
+                index.setdefault(reb.text, []).append(entry)
+
+    def _entry_data(self, entry):
+        entry_data = self._parsed.get(entry)
+        if entry_data is None:
+            entry_data = self._parsed[entry] = self._parse_entry(entry)
+        return entry_data
 
     def _parse_entry(self, entry):
         k_list = []
@@ -68,9 +98,7 @@ class JMDict:
 
     def lookup_word(self, word: str) -> List[Dict]:
         """Return all entries for this word (raw structured JMdict data)."""
-        result = self.index.get(word, [])
-
-        return result if isinstance(result, list) else [result]
+        return [self._entry_data(entry) for entry in self.index.get(word, [])]
 
     def get_best_entry(self, word: str) -> Dict:
         """
@@ -102,41 +130,39 @@ class JMDict:
         if not entries:
             return []
 
-        kana_only = KANA_RE.fullmatch(search_word) is not None
+        # most words have a single entry, which wins under either tie break
+        if len(entries) == 1 and tie_break in ("all", "defs"):
+            return list(entries)
 
-        def score_tags(tags):
-            score = 0
-            for tag in tags:
-                if tag.startswith("nf"):
-                    try:
-                        n = int(tag[2:])
-                        score += (49 - n) * 100
-                    except ValueError:
-                        continue
-                elif tag in PRI_BONUS:
-                    score += PRI_BONUS[tag]
-            return score
+        score_tags = _score_pri_tags
 
         def score_entry(entry):
             score = 0
             matched = False
             for k in entry["kanji"]:
                 if k["form"] == search_word:
-                    score += score_tags(k.get("pri", []))
+                    score += score_tags(k["pri"])
                     matched = True
             for r in entry["reading"]:
                 if r["form"] == search_word:
-                    score += score_tags(r.get("pri", []))
+                    score += score_tags(r["pri"])
                     matched = True
             if not matched:
                 for r in entry["reading"]:
-                    score += score_tags(r.get("pri", []))
+                    score += score_tags(r["pri"])
                     break
             return score
 
-        scored = [(e, score_entry(e)) for e in entries]
-        max_score = max(score for _, score in scored)
-        top_entries = [e for e, score in scored if score == max_score]
+        # one pass: keep only the entries tied for the best score so far
+        max_score = None
+        top_entries = []
+        for e in entries:
+            score = score_entry(e)
+            if max_score is None or score > max_score:
+                max_score = score
+                top_entries = [e]
+            elif score == max_score:
+                top_entries.append(e)
 
         if tie_break == "all":
             return top_entries
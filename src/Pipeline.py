@@ -6,7 +6,8 @@ from src.PipelineStep import PipelineStep, ProgressEvent
 
 class Pipeline:
     def __init__(self, steps: Iterable[PipelineStep], on_progress=None):
-        self.steps: List[PipelineStep] = list(steps)
+        # optional steps are passed as None (e.g. debug dumps when not debugging)
+        self.steps: List[PipelineStep] = [step for step in steps if step is not None]
         self.on_progress = on_progress
 
         for step in self.steps:
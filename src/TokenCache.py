@@ -1,7 +1,10 @@
 import json
 import hashlib
+import os
 import unicodedata
 import pickle
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
@@ -13,6 +16,11 @@ class TokenCache:
         self.cache_dir.mkdir(parents=True, exist_ok=True)
 
         self.mtime_index_path = self.cache_dir / "mtime_index.json"
+        self.lemma_readings_path = self.cache_dir / "lemma_readings.json"
+
+        # payload paths are built by plain string concatenation from this
+        # prefix instead of a pathlib join per lookup and per write
+        self._payload_prefix = os.path.join(self.cache_dir, "")
 
         if self.mtime_index_path.exists():
             try:
@@ -23,58 +31,150 @@ class TokenCache:
             self._mtime_index = {}
 
         self._mtime_dirty = False
+        self._index_keys = {}
+
+        # Payload writes run behind the tokenizer on one background thread;
+        # key -> future until the file is on disk
+        self._writer = None
+        self._pending_writes = {}
 
 
     # ---------------- helpers ----------------
 
-    def _compute_key(self, normalized_text: str) -> str:
+    def _compute_key(self, normalized_text: str | list[str]) -> str:
         h = hashlib.sha256()
-        h.update(normalized_text.encode("utf-8"))
+
+        if isinstance(normalized_text, str):
+            h.update(normalized_text.encode("utf-8"))
+        else:
+            # Hash a list of lines as if "\n".join()-ed, one line at a time,
+            # so the whole text never has to be joined and encoded in memory
+            for i, line in enumerate(normalized_text):
+                if i:
+                    h.update(b"\n")
+                h.update(line.encode("utf-8"))
+
         h.update(b"\0")
         h.update(self.fingerprint.encode("utf-8"))
         return h.hexdigest()
 
-    def _cache_path(self, key: str) -> Path:
-        return self.cache_dir / f"{key}.pkl"
+    def _cache_path(self, key: str) -> str:
+        return f"{self._payload_prefix}{key}.pkl"
+
+    def _index_key(self, path: Path) -> str:
+        # resolve() hits the filesystem; lookup and store use the same key
+        key = self._index_keys.get(path)
+        if key is None:
+            key = self._index_keys[path] = str(path.resolve())
+        return key
+
+    def _write_atomic(self, path: Path | str, data: bytes):
+        # write to a temp file and swap it in, so a reader (or a second
+        # run) never sees a half-written file; the temp name is unique so
+        # concurrent runs writing the same key can't clobber each other
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except FileNotFoundError:
+                pass
+            raise
+
+    def _write_payload(self, path: str, payload: dict):
+        self._write_atomic(path, pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def _wait_for_writes(self):
+        pending = self._pending_writes
+        self._pending_writes = {}
+
+        for future in pending.values():
+            future.result()
 
     def flush_mtime_index(self):
+        # the index must never point at a payload that isn't written yet
+        self._wait_for_writes()
+
+        # don't leave an idle writer thread behind after each run;
+        # put() starts a new one if the cache is used again
+        if self._writer is not None:
+            self._writer.shutdown(wait=True)
+            self._writer = None
+
         if not self._mtime_dirty:
             return
 
-        self.mtime_index_path.write_text(
-            json.dumps(self._mtime_index, ensure_ascii=False),
-            encoding="utf-8",
+        self._write_atomic(
+            self.mtime_index_path,
+            json.dumps(self._mtime_index, ensure_ascii=False).encode("utf-8"),
         )
         self._mtime_dirty = False
 
 
+    # ---------------- lemma readings ----------------
+
+    def load_lemma_readings(self) -> dict:
+        try:
+            data = json.loads(self.lemma_readings_path.read_text("utf-8"))
+        except Exception:
+            return {}
+
+        # readings come from the tokenizer dictionary; drop them when it changes
+        if data.get("fingerprint") != self.fingerprint:
+            return {}
+
+        return data.get("readings", {})
+
+    def save_lemma_readings(self, readings: dict):
+        self._write_atomic(
+            self.lemma_readings_path,
+            json.dumps(
+                {"fingerprint": self.fingerprint, "readings": readings},
+                ensure_ascii=False,
+            ).encode("utf-8"),
+        )
+
+
     # ---------------- hash-based cache ----------------
 
     def load_by_hash(self, key: str):
         path = self._cache_path(key)
-        if not path.exists():
-            return None
 
+        pending = self._pending_writes.pop(key, None)
+        if pending is not None:
+            pending.result()
+
+        # One read() and an in-memory unpickle: pickle.load() on a file
+        # object goes back through Python-level reads for every frame.
         try:
             with open(path, "rb") as f:
-                return pickle.load(f)
+                return pickle.loads(f.read())
+        except FileNotFoundError:
+            return None
         except Exception:
-            path.unlink(missing_ok=True)
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
             return None
 
-    def put(self, text: str, tokens):
+    def put(self, text: str | list[str], tokens):
         key = self._compute_key(text)
         path = self._cache_path(key)
 
         payload = {
             "tokenizer_fingerprint": self.fingerprint,
             "created_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
-            "token_count": len(tokens),
             "tokens": tokens,
         }
 
-        with open(path, "wb") as f:
-            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        if self._writer is None:
+            self._writer = ThreadPoolExecutor(max_workers=1)
+
+        self._pending_writes[key] = self._writer.submit(self._write_payload, path, payload)
 
         return key
 
@@ -82,7 +182,7 @@ class TokenCache:
     # ---------------- mtime-based shortcut ----------------
 
     def get_hash_by_mtime(self, path: Path, mtime_ns: int):
-        entry = self._mtime_index.get(str(path.resolve()))
+        entry = self._mtime_index.get(self._index_key(path))
         if (
             entry
             and entry["mtime"] == mtime_ns
@@ -92,12 +192,10 @@ class TokenCache:
         return None
 
 
-    def put_by_mtime(self, path: Path, mtime_ns: int, text: str, tokens):
-        content_hash = self._compute_key(text)
-
-        self.put(text, tokens)
+    def put_by_mtime(self, path: Path, mtime_ns: int, text: str | list[str], tokens):
+        content_hash = self.put(text, tokens)
 
-        self._mtime_index[str(path.resolve())] = {
+        self._mtime_index[self._index_key(path)] = {
             "mtime": mtime_ns,
             "hash": content_hash,
             "fingerprint": self.fingerprint,
@@ -1,8 +1,7 @@
-import re
 from dataclasses import dataclass
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Sentence:
     text: str
     tag: str
@@ -14,25 +13,18 @@ class Sentence:
         return f'{self.text}'#' [{self.tag}][{self.origin}][{self.surface_form}]'
 
     def to_html(self) -> str:
-        text = self.text
-
-        pattern = re.escape(self.surface_form)
-        text = re.sub(
-            pattern,
-            rf"<span class='highlight'>{self.surface_form}</span>",
-            text,
-            count=1
+        # surface_form is a literal, so a plain replace highlights the first
+        # occurrence without building a regex per call
+        text = self.text.replace(
+            self.surface_form,
+            f"<span class='highlight'>{self.surface_form}</span>",
+            1
         )
 
         return f"{text}<br><span class='tag sentence-tag'>{self.tag} - {self.score}</span>"
 
-@dataclass(frozen=False)
+@dataclass(frozen=False, slots=True)
 class WordStats:
-    __slots__ = (
-        "index", "index_count", "frequency", "score", "reading",
-        "definition", "tags", "sentences", "lemma",
-        "pos", "invalid"
-    )
     index: float       # running mean of normalized position (0=start, 1=end)
     index_count: int   # number of files that have contributed to index
     frequency: int
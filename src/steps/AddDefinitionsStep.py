@@ -1,4 +1,6 @@
 import appdirs
+import os
+import pickle
 from pathlib import Path
 
 from src.Artifact import Artifact
@@ -15,7 +17,12 @@ class AddDefinitionsStep(PipelineStep):
 
 
     def process(self, artifact: Artifact, debug=False) -> Artifact:
-        data, total_valid, total_invalid = add_and_filter_for_definitions(artifact.data, self.progress, self.on_definition_processed)
+        data, total_valid, total_invalid = add_and_filter_for_definitions(
+            artifact.data,
+            self.progress,
+            self.on_definition_processed,
+            cache_path=Path(appdirs.user_cache_dir("tango_miner")) / "definitions.pkl",
+        )
 
         self.done(f'{total_valid} tokens kept.')
 
@@ -25,23 +32,131 @@ class AddDefinitionsStep(PipelineStep):
         return Artifact(data, sentences=artifact.sentences)
 
 
-def add_and_filter_for_definitions(input: dict, progress_handler, on_definition_processed):
+JMDICT_PATH = Path.home() / "JMdict_e.xml"
+
+# cached definitions can be None, so misses need their own marker
+_MISSING = object()
+
+DEFINITIONS_VERSION = "defs-v1.2026/10/15"
+# Bump whenever JMDict's entry ranking or definition formatting changes, so
+# cached definitions built by the old code are dropped
+
+DEFINITIONS_CHECKPOINT_INTERVAL = 5000
+# New definitions looked up between saves of the definitions cache, so a
+# long first run that is interrupted keeps most of its lookups
+
+_jmdict = None
+
+
+def get_jmdict() -> JMDict:
+    # Parsing and indexing the XML takes seconds; keep one instance for
+    # every run of the step in this process
+    global _jmdict
+
+    if _jmdict is None:
+        _jmdict = JMDict(JMDICT_PATH)
+
+    return _jmdict
+
+
+def jmdict_fingerprint() -> str | None:
+    try:
+        st = JMDICT_PATH.stat()
+    except OSError:
+        return None
+
+    return f"{DEFINITIONS_VERSION}:{st.st_mtime_ns}:{st.st_size}"
+
+
+# cache path -> (JMdict fingerprint, definitions), so later runs of the
+# step in the same process reuse the live dict instead of re-reading JSON
+_loaded_definitions = {}
+
+
+def load_definitions_cache(cache_path: Path) -> dict:
+    fingerprint = jmdict_fingerprint()
+
+    loaded = _loaded_definitions.get(cache_path)
+    if loaded is not None and loaded[0] == fingerprint:
+        return loaded[1]
+
+    definitions = _read_definitions_cache(cache_path, fingerprint)
+    _loaded_definitions[cache_path] = (fingerprint, definitions)
+
+    return definitions
+
+
+def _read_definitions_cache(cache_path: Path, fingerprint: str | None) -> dict:
+    try:
+        with open(cache_path, "rb") as f:
+            data = pickle.loads(f.read())
+    except Exception:
+        return {}
+
+    # definitions are only valid for the JMdict file and code they came from
+    if data.get("fingerprint") != fingerprint:
+        return {}
+
+    return data.get("definitions", {})
+
+
+def save_definitions_cache(cache_path: Path, definitions: dict):
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # pickled like the token cache payloads: it is rewritten at every
+    # checkpoint, and pickle is far cheaper than JSON to dump and load.
+    # Written next to the cache and swapped in, so an interrupted save
+    # never leaves a truncated file behind
+    tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+    tmp_path.write_bytes(
+        pickle.dumps(
+            {"fingerprint": jmdict_fingerprint(), "definitions": definitions},
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+    )
+    os.replace(tmp_path, cache_path)
+
+
+def add_and_filter_for_definitions(input: dict, progress_handler, on_definition_processed, cache_path: Path | None = None):
     total = len(input)
-    kept = {}
     total_valid = 0
     total_invalid = 0
 
     progress_handler(0, total, 'Initializing dictionary...')
-    
-    jmdict = JMDict(Path.home() / "JMdict_e.xml")
+
+    # word -> definition (None when JMdict has none), held in memory for the
+    # whole run and checkpointed every DEFINITIONS_CHECKPOINT_INTERVAL new
+    # entries; JMdict itself is only parsed on a miss
+    cached_results = load_definitions_cache(cache_path) if cache_path else {}
+    unsaved = 0
+
+    # report roughly every 1% instead of once per word
+    progress_step = max(1, total // 100)
 
     # print(f'total words to process: {total}')
     # print(f'total words to look up: {len(words_to_lookup)}')
     # print(f'total cached words: {len(cached_results)}')
 
+    # JMdict lookups are pure Python over an in-memory index, so they are
+    # GIL-bound and gain nothing from a thread pool; instead keep the loop
+    # lean: one cache probe per word, the lookup method bound on first miss
+    cached_get = cached_results.get
+    lookup = None
+
     for i, word in enumerate(input):
-        definition = jmdict.get_most_common_definition(word)
-        
+        definition = cached_get(word, _MISSING)
+
+        if definition is _MISSING:
+            if lookup is None:
+                lookup = get_jmdict().get_most_common_definition
+
+            definition = cached_results[word] = lookup(word)
+            unsaved += 1
+
+            if cache_path and unsaved >= DEFINITIONS_CHECKPOINT_INTERVAL:
+                save_definitions_cache(cache_path, cached_results)
+                unsaved = 0
+
         if definition:
             total_valid += 1
         else:
@@ -50,14 +165,19 @@ def add_and_filter_for_definitions(input: dict, progress_handler, on_definition_
         if on_definition_processed:
             on_definition_processed(word, definition)
 
-        progress_handler(i, total, f'{i}/{total} {total_valid} definitions found')
+        if i % progress_step == 0:
+            progress_handler(i, total, f'{i}/{total} {total_valid} definitions found')
 
+        # every word is kept (invalid ones are only flagged), so the
+        # stats are updated in place rather than copied into a new dict
         stats = input[word]
         stats.definition = definition
         stats.invalid = not definition
-        kept[word] = stats
 
-    return kept, total_valid, total_invalid
+    if cache_path and unsaved:
+        save_definitions_cache(cache_path, cached_results)
+
+    return input, total_valid, total_invalid
 
 
 def dump_invalid_words(word_data: dict):
@@ -67,8 +187,10 @@ def dump_invalid_words(word_data: dict):
     output_path = base_dir / "invalid_words.txt"
 
     with output_path.open("w", encoding="utf-8") as f:
-        for word, stats in word_data.items():
-            if stats.invalid:
-                f.write(f"{word}\t{stats.reading}\t{' '.join(sorted(stats.tags))}\n")
+        f.write("".join(
+            f"{word}\t{stats.reading}\t{' '.join(sorted(stats.tags))}\n"
+            for word, stats in word_data.items()
+            if stats.invalid
+        ))
 
     print(f"Invalid words dumped to {output_path}")
\ No newline at end of file
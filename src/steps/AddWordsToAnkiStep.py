@@ -1,6 +1,5 @@
 import json
 import urllib.request
-from collections import OrderedDict
 from typing import Any
 
 from src.Artifact import Artifact
@@ -103,14 +102,12 @@ def export_words_to_anki(
     # --------------------------------------------------
     # 2.5 DELETE OBSOLETE NOTES
     # --------------------------------------------------
-    desired_words = desired_words = {
+    desired_words = {
         w for w, stats in words.items()
         if not stats.invalid
     }
 
-    existing_set = set(existing_words.keys())
-
-    obsolete_words = existing_set - desired_words
+    obsolete_words = existing_words.keys() - desired_words
     obsolete_note_ids = [
         existing_words[word]["noteId"]
         for word in obsolete_words
@@ -127,6 +124,7 @@ def export_words_to_anki(
     # 3. Prepare add + update batches
     # --------------------------------------------------
     notes_to_add = []
+    new_words = []
     update_actions = []
     total_notes_to_update = 0
 
@@ -134,13 +132,16 @@ def export_words_to_anki(
         if word not in desired_words:
             continue
 
-        new_tags = set(stats.tags)
+        # stats.tags is already a set; no need to copy it per word
+        new_tags = stats.tags
 
         if word in existing_words:
             note = existing_words[word]
             note_id = note["noteId"]
 
-            dirty = anki_fields_differ_from_stats(note, stats)
+            # rendered once and shared by the diff and the update
+            sentence_html = sentences_to_html(stats)
+            dirty = anki_fields_differ_from_stats(note, stats, sentence_html)
 
             if dirty:
                 update_actions.append({
@@ -148,19 +149,22 @@ def export_words_to_anki(
                     "params": {
                         "note": {
                             "id": note_id,
-                            "fields": word_to_anki_fields(word, stats)
+                            "fields": word_to_anki_fields(word, stats, sentence_html)
                         }
                     }
                 })
 
-            old_tags = set(note["tags"])
-            new_tags = set(stats.tags)
+            note_tags = note["tags"]
+
+            # unchanged tags (including none on either side) are the common
+            # case on a re-export; skip building and diffing sets for them
+            if len(note_tags) == len(new_tags) and new_tags.issuperset(note_tags):
+                to_add = to_remove = None
+            else:
+                old_tags = set(note_tags)
 
-            to_add = new_tags - old_tags
-            to_remove = {
-                t for t in old_tags
-                if t not in new_tags
-            }
+                to_add = new_tags - old_tags
+                to_remove = old_tags - new_tags
 
             if to_add:
                 update_actions.append({
@@ -183,26 +187,49 @@ def export_words_to_anki(
             if dirty or to_add or to_remove:
                 total_notes_to_update += 1
         else:
-            dup_ids = anki_invoke("findNotes", {
-                "query": f'deck:\"{deck_name}\" note:\"{model_name}\" Expression:\"{word}\"'
-            })
-            
-            if dup_ids:
+            new_words.append((word, stats))
+
+        progress_handler(
+            25 + (i / len(words) * 25),
+            100,
+            "Preparing actions..."
+        )
+
+    # --------------------------------------------------
+    # 3.5 Skip new words that already have a note
+    # --------------------------------------------------
+    # one "multi" request per batch instead of a findNotes round trip
+    # per new word; versioned sub-actions report their own errors
+    for i in range(0, len(new_words), batch_size):
+        batch = new_words[i:i + batch_size]
+
+        dup_results = anki_invoke("multi", {
+            "actions": [
+                {
+                    "action": "findNotes",
+                    "version": 6,
+                    "params": {
+                        "query": f'deck:\"{deck_name}\" note:\"{model_name}\" Expression:\"{word}\"'
+                    }
+                }
+                for word, _ in batch
+            ]
+        })
+
+        for (word, stats), dup_result in zip(batch, dup_results):
+            if dup_result.get("error"):
+                raise AnkiConnectError(dup_result["error"])
+
+            if dup_result["result"]:
                 continue
 
             notes_to_add.append({
                 "deckName": deck_name,
                 "modelName": model_name,
                 "fields": word_to_anki_fields(word, stats),
-                "tags": list(new_tags),
+                "tags": list(stats.tags),
             })
 
-        progress_handler(
-            25 + (i / len(words) * 25),
-            100,
-            "Preparing actions..."
-        )
-
     total = len(update_actions) + len(notes_to_add)
     processed = 0
 
@@ -243,7 +270,16 @@ def export_words_to_anki(
     return total_notes_to_add, total_notes_to_update, total_notes_to_delete
 
 
-def word_to_anki_fields(word: str, stats):
+def sentences_to_html(stats) -> str:
+    return "<br><br>".join(
+        s.to_html() for s in stats.sentences
+    ) if stats.sentences else ""
+
+
+def word_to_anki_fields(word: str, stats, sentence_html: str | None = None):
+    if sentence_html is None:
+        sentence_html = sentences_to_html(stats)
+
     return {
         "Expression": word,
         "Reading": stats.reading,
@@ -251,25 +287,24 @@ def word_to_anki_fields(word: str, stats):
         "Frequency": str(int(stats.frequency)),
         "Score": str(stats.score),
         "Meaning": stats.definition,
-        "Sentence": "<br><br>".join(
-            s.to_html() for s in stats.sentences
-        ) if stats.sentences else ""
+        "Sentence": sentence_html
     }
 
 
-def anki_fields_differ_from_stats(note, stats) -> bool:
-    note_fields = note["fields"]
+# Stats attributes compared against their Anki field, built once at import
+STATS_TO_NOTE_FIELDS = (
+    ("reading", "Reading"),
+    ("definition", "Meaning"),
+    ("index", "Index"),
+    ("frequency", "Frequency"),
+    ("score", "Score"),
+)
 
-    # Map stats attributes to Anki field names and whether they need str()
-    stats_to_note_fields = {
-        "reading": "Reading",
-        "definition": "Meaning",
-        "index": "Index",
-        "frequency": "Frequency",
-        "score": "Score",
-    }
 
-    for attr, field_name in stats_to_note_fields.items():
+def anki_fields_differ_from_stats(note, stats, sentence_html: str | None = None) -> bool:
+    note_fields = note["fields"]
+
+    for attr, field_name in STATS_TO_NOTE_FIELDS:
         stats_value = str(getattr(stats, attr, ""))
         note_value = note_fields[field_name]["value"]
         
@@ -279,12 +314,12 @@ def anki_fields_differ_from_stats(note, stats) -> bool:
 
     # Handle sentence separately
     note_sentence = note_fields["Sentence"]["value"]
-    stats_sentence = "<br><br>".join(
-        s.to_html() for s in stats.sentences
-    ) if stats.sentences else ""
-    
-    if stats_sentence != note_sentence:
-        # print(f'sentences differ: {stats_sentence} != {note_sentence}')
+
+    if sentence_html is None:
+        sentence_html = sentences_to_html(stats)
+
+    if sentence_html != note_sentence:
+        # print(f'sentences differ: {sentence_html} != {note_sentence}')
         return True
 
     return False
@@ -6,7 +6,6 @@ from src.WordStats import Sentence, WordStats
 
 from collections import defaultdict
 from itertools import count
-import heapq
 import re
 from bisect import bisect_right
 
@@ -17,12 +16,6 @@ from bisect import bisect_right
 MAX_SENTENCES = 3
 # Max number of example sentences stored per word
 
-GLOBAL_AVERAGE_SCORE = 3000
-# Fallback difficulty score when no known words exist in a sentence
-# Range: ~100–1000 depending on your word scoring system
-# Higher → treats unknown sentences as harder
-# Lower → treats unknown sentences as easier (more likely to be selected)
-
 IDEAL_LENGTH = 25
 # Target sentence length in characters
 # Range: 10–60 depending on corpus style
@@ -83,13 +76,13 @@ class AttachSentencesStep(PipelineStep):
 
 
     def process(self, artifact: Artifact) -> Artifact:
-        attach_sentences(
+        attached = attach_sentences(
             artifact.data,
             artifact.sentences,
             self.progress,
         )
 
-        self.done(f"{sum(len(sentences) for word in artifact.data for sentences in word)} sentences added.")
+        self.done(f"{attached} sentences added.")
 
         return artifact
 
@@ -98,31 +91,22 @@ class AttachSentencesStep(PipelineStep):
 # Helpers
 # ---------------------------------------------------------------------------
 
-def _is_japanese_char(c: str) -> bool:
-    o = ord(c)
-    return (
-        0x3040 <= o <= 0x309F or
-        0x30A0 <= o <= 0x30FF or
-        0x4E00 <= o <= 0x9FFF
-    )
-
-
-def _percentile(values, p=0.9):
-    s = sorted(values)
-    if not s:
-        return GLOBAL_AVERAGE_SCORE
-    return s[min(int(len(s) * p), len(s) - 1)]
+# Hiragana (U+3040–309F), katakana (U+30A0–30FF) and CJK unified ideographs
+# (U+4E00–9FFF), for whole-string scans
+RE_JAPANESE_CHAR = re.compile("[\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FFF]")
+RE_KANJI = re.compile("[\u4e00-\u9fff]")
 
 
 # ---------------------------------------------------------------------------
 # Core pipeline
 # ---------------------------------------------------------------------------
 
-def attach_sentences(word_data, segmented_sentences, progress_handler=None):
+def attach_sentences(word_data, segmented_sentences, progress_handler=None) -> int:
+    """Attach example sentences to word_data in place; returns how many were attached."""
     total = len(segmented_sentences)
 
     if not word_data or not segmented_sentences:
-        return
+        return 0
 
     max_score = max(ws.score for ws in word_data.values())
 
@@ -142,13 +126,17 @@ def attach_sentences(word_data, segmented_sentences, progress_handler=None):
         # ------------------------------------------------------------
         scores = []
         unknown_count = 0
+        # (lemma, surface, stats) of the known words, kept for phase 3 so
+        # each lemma is looked up in word_data only once per sentence
+        known = []
 
-        for lemma in lemma_surfaces:
+        for lemma, surface in lemma_surfaces.items():
             ws = word_get(lemma)
             if ws is None:
                 unknown_count += 1
             else:
                 scores.append(ws.score)
+                known.append((lemma, surface, ws))
 
         # Don't skip sentences with no scored tokens — they still contain
         # the target word and may be the only available sentence for it.
@@ -156,12 +144,10 @@ def attach_sentences(word_data, segmented_sentences, progress_handler=None):
         if scores:
             mean = sum(scores) / len(scores)
             variance = sum((x - mean) ** 2 for x in scores) / len(scores)
-            sentence_difficulty = _percentile(scores, 0.9)
             sorted_scores = sorted(scores)
         else:
             mean = 0.0
             variance = 0.0
-            sentence_difficulty = 0.0
             sorted_scores = []
 
         # ------------------------------------------------------------
@@ -184,14 +170,13 @@ def attach_sentences(word_data, segmented_sentences, progress_handler=None):
         if total_tokens == 0:
             continue
 
+        key = _sentence_dedupe_key_fast(text)
+        rounded_mean = round(mean, 2)
+
         # ------------------------------------------------------------
         # PHASE 3: per-lemma scoring (optimized)
         # ------------------------------------------------------------
-        for lemma, surface in lemma_surfaces.items():
-            ws = word_get(lemma)
-            if ws is None:
-                continue
-
+        for lemma, surface, ws in known:
             # Fraction of sentence words that score harder than this word [0, 1]
             too_hard = len(sorted_scores) - bisect_right(sorted_scores, ws.score)
 
@@ -204,33 +189,45 @@ def attach_sentences(word_data, segmented_sentences, progress_handler=None):
                 + (too_hard / total_tokens) * TOO_HARD_WORD_PENALTY
             )
 
+            # Each bucket only ever holds the MAX_SENTENCES best candidates
+            # (one per dedupe key), so memory stays bounded per word and a
+            # newcomer only has to beat the current worst of a few entries.
+            bucket = candidates[lemma]
+            existing = bucket.get(key)
+
+            if existing is not None:
+                if fitness >= existing[0]:
+                    continue
+            elif len(bucket) >= MAX_SENTENCES:
+                worst = max(bucket.values())
+                if fitness >= worst[0]:
+                    continue
+                del bucket[worst[2]]
+
+            # Only build the Sentence when it actually takes a slot
             sentence = Sentence(
-                text = seg.text,
+                text = text,
                 tag = seg.tag,
                 origin = seg.origin,
                 surface_form = surface,
-                score = round(mean, 2)
+                score = rounded_mean
             )
 
-            key = _sentence_dedupe_key_fast(text)
-            bucket = candidates[lemma]
-
-            existing = bucket.get(key)
-            item = (fitness, next(counter), sentence)
-
-            if existing is None or fitness < existing[0]:
-                bucket[key] = item
+            bucket[key] = (fitness, next(counter), key, sentence)
 
     # ------------------------------------------------------------
     # FINALIZE — primary pass
     # ------------------------------------------------------------
+    # counted as they are attached, so the step never rescans word_data
+    attached = 0
+
     for lemma, bucket in candidates.items():
         ws = word_get(lemma)
         if not ws:
             continue
 
-        best = heapq.nsmallest(MAX_SENTENCES, bucket.values(), key=lambda x: x[0])
-        ws.sentences = [b[2] for b in best]
+        ws.sentences = [b[3] for b in sorted(bucket.values())]
+        attached += len(ws.sentences)
 
     # ------------------------------------------------------------
     # FALLBACK — guarantee at least MAX_SENTENCES per word
@@ -242,37 +239,40 @@ def attach_sentences(word_data, segmented_sentences, progress_handler=None):
     # learner gets a mediocre sentence; best-case they get
     # something useful they would otherwise have missed.
     # ------------------------------------------------------------
-    words_needing_fallback = {
-        lemma
+    # lemma → texts already attached, built once so duplicate checks
+    # below are a set lookup instead of a rescan of ws.sentences
+    attached_texts = {
+        lemma: {s.text for s in ws.sentences}
         for lemma, ws in word_data.items()
         if len(ws.sentences) < MAX_SENTENCES
     }
 
-    if words_needing_fallback:
+    if attached_texts:
         # Build an index: lemma → list[Sentence] not yet attached
         fallback_pool = defaultdict(list)
 
         for seg in segmented_sentences:
+            text = seg.text
+
             for lemma, surface in seg.lemma_surfaces.items():
-                if lemma not in words_needing_fallback:
+                already = attached_texts.get(lemma)
+
+                # skip words that don't need a fallback and exact
+                # duplicates already attached
+                if already is None or text in already:
                     continue
 
                 ws = word_get(lemma)
                 if ws is None:
                     continue
 
-                sentence = Sentence(
-                    text = seg.text,
+                fallback_pool[lemma].append(Sentence(
+                    text = text,
                     tag = seg.tag,
                     origin = seg.origin,
                     surface_form = surface,
                     score = ws.score * -1
-                )
-
-                # skip exact duplicates already attached
-                already = {s.text for s in ws.sentences}
-                if sentence.text not in already:
-                    fallback_pool[lemma].append(sentence)
+                ))
 
         for lemma, pool in fallback_pool.items():
             ws = word_get(lemma)
@@ -283,7 +283,7 @@ def attach_sentences(word_data, segmented_sentences, progress_handler=None):
             if needed <= 0:
                 continue
 
-            already = {s.text for s in ws.sentences}
+            already = attached_texts[lemma]
             for sentence in pool:
                 if needed <= 0:
                     break
@@ -291,6 +291,9 @@ def attach_sentences(word_data, segmented_sentences, progress_handler=None):
                     ws.sentences.append(sentence)
                     already.add(sentence.text)
                     needed -= 1
+                    attached += 1
+
+    return attached
 
 
 # ---------------------------------------------------------------------------
@@ -320,15 +323,10 @@ def _sentence_quality_penalty_fast(text):
     penalty += text.count("[...]") * 0.25
     penalty += text.count("「") * 0.05
 
-    visible = 0
-    jp = 0
-
-    for c in text:
-        if c.isspace():
-            continue
-        visible += 1
-        if _is_japanese_char(c):
-            jp += 1
+    # str.split() drops exactly the isspace() characters; counting by
+    # deletion keeps both scans in C instead of a per-character loop
+    visible = len("".join(text.split()))
+    jp = len(text) - len(RE_JAPANESE_CHAR.sub("", text))
 
     if visible:
         penalty += 1 - (jp / visible)
@@ -349,7 +347,7 @@ def _sentence_dedupe_key_fast(text: str) -> str:
 
     prefix, body = text.split(">", 1)
 
-    if body and any("\u4e00" <= c <= "\u9fff" for c in body):
+    if body and RE_KANJI.search(body):
         return body.strip()
 
     return text
\ No newline at end of file
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import multiprocessing
+import os
 import re
 import statistics
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
 from typing import List
 
@@ -25,21 +29,34 @@ RE_SENTENCE_BOUNDARY = re.compile(rf'({PUNCT_CHARS}+)\s*(?=[^\s。．！？!?])'
 # Invisible and formatting Unicode characters that produce phantom tokens.
 # Covers: zero-width spaces, directional embeddings (U+202A etc. seen in Nana
 # ebook exports), word joiners, BOM, and C0/C1 control chars except newline/tab.
-RE_INVISIBLE_CHARS = re.compile(
-    r"[\u200b\u200c\u200d\u200e\u200f"        # zero-width variants
-    r"\u202a-\u202e"                           # directional embeddings/overrides
-    r"\u2060-\u2064"                           # word joiner and friends
-    r"\ufeff"                                  # BOM / zero-width no-break space
-    r"\u0000-\u0008\u000b\u000c\u000e-\u001f" # C0 controls (keep \t \n)
-    r"\u007f-\u009f"                           # DEL + C1 controls
-    r"\u309a"                                  # combining dakuten as standalone char
-    r"]"
+INVISIBLE_CHAR_RANGES = (
+    (0x200B, 0x200F),   # zero-width variants
+    (0x202A, 0x202E),   # directional embeddings/overrides
+    (0x2060, 0x2064),   # word joiner and friends
+    (0xFEFF, 0xFEFF),   # BOM / zero-width no-break space
+    (0x0000, 0x0008),   # C0 controls (keep \t \n)
+    (0x000B, 0x000C),
+    (0x000E, 0x001F),
+    (0x007F, 0x009F),   # DEL + C1 controls
+    (0x309A, 0x309A),   # combining dakuten as standalone char
 )
 
 # Script-formatting characters used as dialogue/UI chrome in some game scripts
 # (Persona series uses ⋯ U+22EF as ellipsis, ‒ U+2012 as dash, {}> as markers).
 # Stripped wholesale since they carry no linguistic content.
-RE_SCRIPT_FORMATTING = re.compile(r"[{}>‒\u22ef]+")
+SCRIPT_FORMATTING_CHARS = "{}>‒\u22ef"
+
+# Single str.translate table deleting both groups in one pass over the text
+STRIP_CHARS_TABLE = {
+    **{cp: None for lo, hi in INVISIBLE_CHAR_RANGES for cp in range(lo, hi + 1)},
+    **dict.fromkeys(map(ord, SCRIPT_FORMATTING_CHARS)),
+}
+
+EXTRACT_WORKERS = os.cpu_count() or 1
+# Worker processes used to extract sentences from several files at once
+
+PARALLEL_MIN_CHARS = 2_000_000
+# Below this many characters in total, process startup costs more than it saves
 
 JP_CONTINUATIONS = (
     "そして", "しかし", "また", "それ", "これ", "だから", "そのため"
@@ -60,30 +77,50 @@ class ExtractSentencesStep(PipelineStep):
         files: list[tuple[Path, str]] = artifact.data
         results: list[tuple[Path, list[str]]] = []
 
-        for path, text in files:
-            self.progress(len(results), len(files))
-
-            text = RE_INVISIBLE_CHARS.sub("", text)
-            text = RE_SCRIPT_FORMATTING.sub("", text)
-            sentences, _ = normalize_sentence_boundaries(
-                text,
-                self.min_lines)
-
-            results.append((path, sentences))
+        total_chars = sum(len(text) for _, text in files)
+
+        if EXTRACT_WORKERS > 1 and len(files) > 1 and total_chars >= PARALLEL_MIN_CHARS:
+            # files are independent; extract them in worker processes and
+            # collect the results back in input order
+            # spawned, not forked: the tokenizer and token cache thread pools
+            # can still be alive from an earlier run in this process
+            with ProcessPoolExecutor(
+                max_workers=min(EXTRACT_WORKERS, len(files)),
+                mp_context=multiprocessing.get_context("spawn"),
+            ) as pool:
+                extracted = pool.map(extract_sentences, (text for _, text in files), repeat(self.min_lines))
+
+                for (path, _), sentences in zip(files, extracted):
+                    self.progress(len(results), len(files))
+                    results.append((path, sentences))
+        else:
+            for path, text in files:
+                self.progress(len(results), len(files))
+                results.append((path, extract_sentences(text, self.min_lines)))
 
         self.done(f"{sum(len(sentences) for _, sentences in results)} sentences extracted.")
 
         return Artifact(results)
 
 
+def extract_sentences(text: str, min_lines: int = 5) -> list[str]:
+    text = text.translate(STRIP_CHARS_TABLE)
+    sentences, _ = normalize_sentence_boundaries(text, min_lines)
+    return sentences
+
+
 def normalize_sentence_boundaries(text: str, min_lines: int = 5):
     lines = text.split("\n")
 
+    # stripped non-empty lines, shared by the detectors below instead of
+    # each one re-stripping the whole file
+    clean = clean_lines(lines)
+
     if is_indented_continuation_mode(lines):
         mode = "indented_continuation"
-    elif is_dialogue_line_mode(lines):
+    elif is_dialogue_line_mode(lines, clean):
         mode = "line_dialogue"
-    elif is_sentence_list(lines):
+    elif is_sentence_list(lines, clean):
         mode = "sentence_list"
     else:
         mode = "paragraph"
@@ -91,9 +128,9 @@ def normalize_sentence_boundaries(text: str, min_lines: int = 5):
     if mode == "indented_continuation":
         sentences = join_indented_continuations(lines)
     elif mode == "line_dialogue":
-        sentences = sentence_per_line(lines)
+        sentences = clean
     elif mode == "sentence_list":
-        sentences = sentence_per_line(lines)
+        sentences = clean
     elif mode == "paragraph":
         sentences = paragraph_based(text)
     else:
@@ -180,8 +217,13 @@ def is_line_sentence_mode(lines: list[str]) -> bool:
     return ratio > 0.7
 
 
-def is_dialogue_line_mode(lines: list[str]) -> bool:
-    clean = [l.strip() for l in lines if l.strip()]
+def clean_lines(lines: list[str]) -> list[str]:
+    return [l for l in map(str.strip, lines) if l]
+
+
+def is_dialogue_line_mode(lines: list[str], clean: list[str] | None = None) -> bool:
+    if clean is None:
+        clean = clean_lines(lines)
     if len(clean) < 5:
         return False
 
@@ -204,8 +246,9 @@ def is_dialogue_line_mode(lines: list[str]) -> bool:
     return punctuation_ratio < 0.4 and ratio > 0.7
 
 
-def is_sentence_list(lines: list[str]) -> bool:
-    clean = [l.strip() for l in lines if l.strip()]
+def is_sentence_list(lines: list[str], clean: list[str] | None = None) -> bool:
+    if clean is None:
+        clean = clean_lines(lines)
     if len(clean) < 3:
         return False
 
@@ -220,11 +263,6 @@ def is_sentence_list(lines: list[str]) -> bool:
     return short_ratio > 0.8
 
 
-def sentence_per_line(lines: List[str]) -> List[str]:
-    # minimal allocation, no strip
-    return [l.strip() for l in lines if l.strip()]
-
-
 def merge_hard_wrap(text: str) -> List[str]:
     text = RE_HARD_WRAP_JOIN.sub("　", text)
     text = RE_MULTI_NEWLINE.sub("\n\n", text)
@@ -290,22 +328,16 @@ def split_on_punctuation(text: str) -> list[str]:
 # Indentation-based continuation detection
 # -------------------------------------------------------------------
 
+INDENT_CHARS = ' \t\u3000'
+
+
 def measure_indent(line: str) -> int:
     """
     Count leading whitespace in visual columns.
     Full-width space (U+3000) counts as 2, tab as 4, regular space as 1.
     """
-    count = 0
-    for ch in line:
-        if ch == ' ':
-            count += 1
-        elif ch == '\t':
-            count += 4
-        elif ch == '\u3000':
-            count += 2
-        else:
-            break
-    return count
+    indent = line[:len(line) - len(line.lstrip(INDENT_CHARS))]
+    return len(indent) + indent.count('\t') * 3 + indent.count('\u3000')
 
 
 def is_indented_continuation_mode(lines: list[str]) -> bool:
@@ -331,21 +363,22 @@ def is_indented_continuation_mode(lines: list[str]) -> bool:
 
 
 def join_indented_continuations(lines: list[str]) -> list[str]:
-    non_empty = [l for l in lines if l.strip()]
-    if not non_empty:
-        return []
-
     result = []
-    current_parts = [non_empty[0].strip()]
-    prev_indent = measure_indent(non_empty[0])
+    current_parts = []
+    prev_indent = 0
+
+    # strip each line once; blank lines neither start nor end a sentence
+    for line in lines:
+        stripped = line.strip()
+        if not stripped:
+            continue
 
-    for line in non_empty[1:]:
         indent = measure_indent(line)
-        if indent < prev_indent:
+        if current_parts and indent < prev_indent:
             result.append("".join(current_parts))
-            current_parts = [line.strip()]
+            current_parts = [stripped]
         else:
-            current_parts.append(line.strip())
+            current_parts.append(stripped)
         prev_indent = indent
 
     if current_parts:
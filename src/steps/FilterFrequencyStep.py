@@ -1,11 +1,6 @@
-from collections import OrderedDict
-from pathlib import Path
-import csv
-import math
-import re
+from heapq import nsmallest
 
 from src.Artifact import Artifact
-from src.Column import Column
 from src.PipelineStep import PipelineStep
 from src.steps.ProcessingStep import ProcessingStep
 
@@ -20,34 +15,27 @@ class FilterFrequencyStep(PipelineStep):
         return Artifact(data, sentences=artifact.sentences)
 
 
-def filter_useful_words(input: OrderedDict, min_frequency: int, keep_percent: int = 98, progress_handler=None) -> OrderedDict:
+def filter_useful_words(input: dict, min_frequency: int, keep_percent: int = 98, progress_handler=None) -> dict:
     total = len(input)
 
     if total == 0:
-        return OrderedDict()
+        return {}
 
-    kept = OrderedDict()
-
-    # Build sorted list of frequencies (no intermediate list)
-    freqs = sorted(s.frequency for s in input.values())
-
-    # Calculate threshold
+    # Calculate threshold: the idx-th smallest frequency, found without
+    # sorting every frequency
     idx = max(0, int(total * (100 - keep_percent) / 100))
-    threshold = max(freqs[idx], min_frequency)
-
-    # Local bindings (hot path)
-    kept_set = kept.__setitem__
-
-    for i, (word, stats) in enumerate(input.items(), 1):
-        if stats.frequency >= threshold:
-            kept_set(word, stats)
-
-        if progress_handler:
-            progress_handler(
-                i,
-                total,
-                f"{len(kept)} tokens filtered."
-            )
+    threshold = max(nsmallest(idx + 1, (s.frequency for s in input.values()))[-1], min_frequency)
+
+    # one comprehension instead of a per-word loop with progress reporting;
+    # plain dicts keep insertion order
+    kept = {
+        word: stats
+        for word, stats in input.items()
+        if stats.frequency >= threshold
+    }
+
+    if progress_handler:
+        progress_handler(total, total, f"{len(kept)} tokens filtered.")
 
     return kept
 
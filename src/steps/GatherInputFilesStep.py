@@ -1,17 +1,18 @@
+import os
 from pathlib import Path
 
 from src.Artifact import Artifact
 from src.PipelineStep import PipelineStep
 
-ALLOWED_FILE_EXTENSIONS = {
-    ".tsv",
-    ".txt",
-    ".csv",
-    ".pdf",
-    ".xml",
-    ".html",
-    ".srt",
-}
+ALLOWED_FILE_EXTENSIONS = frozenset({
+    "tsv",
+    "txt",
+    "csv",
+    "pdf",
+    "xml",
+    "html",
+    "srt",
+})
 
 
 class GatherInputFilesStep(PipelineStep):
@@ -30,9 +31,25 @@ class GatherInputFilesStep(PipelineStep):
         return Artifact(files)
 
 
-def _iter_input_files(directory: Path, include_subdirectories: bool):
-    for f in directory.iterdir():
-        if f.is_file() and f.suffix.lower() in ALLOWED_FILE_EXTENSIONS:
-            yield f
-        elif include_subdirectories and f.is_dir():
-            yield from _iter_input_files(f, include_subdirectories=True)
\ No newline at end of file
+def _iter_input_files(directory: Path | str, include_subdirectories: bool):
+    # os.scandir exposes the file type from the directory listing itself,
+    # so is_file()/is_dir() don't need a stat() per entry like Path does.
+    # Subdirectories are walked by their plain path string; only accepted
+    # files become Path objects. The extension test is inlined against a
+    # local binding of the frozenset, and lower() only runs for names
+    # whose extension isn't already lowercase.
+    allowed = ALLOWED_FILE_EXTENSIONS
+
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            name = entry.name
+            dot = name.rfind(".")
+
+            if dot > 0:
+                ext = name[dot + 1:]
+                if (ext in allowed or ext.lower() in allowed) and entry.is_file():
+                    yield Path(entry.path)
+                    continue
+
+            if include_subdirectories and entry.is_dir():
+                yield from _iter_input_files(entry.path, include_subdirectories=True)
\ No newline at end of file
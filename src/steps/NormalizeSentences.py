@@ -1,3 +1,8 @@
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+import multiprocessing
+import os
 import re
 import unicodedata
 
@@ -7,6 +12,22 @@ from src.steps.ProcessingStep import ProcessingStep
 
 _RE_WHITESPACE = re.compile(r"\s+")
 # _RE_JP_PUNCT_SPACES = re.compile(r"\s*([、。！？「」『』（）])\s*")
+_RE_ARROWS = re.compile(r"→+")
+_RE_HEX_CONTROL = re.compile(r"[A-F0-9]{2}\s")
+_RE_REPEATED_CHAR = re.compile(r"(.)\1{3,}")
+_RE_MIDLINE_ELLIPSIS = re.compile(r"⋯+")
+_RE_ELLIPSIS = re.compile(r"…+")
+_RE_TWO_DOT_LEADER = re.compile(r"‥+")
+_RE_HIRAGANA = re.compile("[\u3040-\u309F]")
+
+NORMALIZE_WORKERS = os.cpu_count() or 1
+# Worker processes used to normalize several files at once
+
+PARALLEL_MIN_SENTENCES = 20000
+# Below this many sentences in total, process startup costs more than it saves
+
+# a plain string, so leading runs can be dropped with one str.lstrip()
+_UNWANTED_PREFIX_CHARS = "×>)）∠*、＊▶・∨◎"
 
 class NormalizeSentences(PipelineStep):
 	def process(self, artifact: Artifact) -> Artifact:
@@ -15,22 +36,42 @@ class NormalizeSentences(PipelineStep):
 		files: list[tuple[Path, list[str]]] = artifact.data
 		results: list[tuple[Path, list[str]]] = []
 
-		for path, sentences in files:
-			self.progress(len(results), len(files))
+		total_sentences = sum(len(sentences) for _, sentences in files)
+
+		if NORMALIZE_WORKERS > 1 and len(files) > 1 and total_sentences >= PARALLEL_MIN_SENTENCES:
+			# files are independent; normalize them in worker processes and
+			# collect the results back in input order
+			# spawned, not forked: the tokenizer and token cache thread pools
+			# can still be alive from an earlier run in this process
+			with ProcessPoolExecutor(
+				max_workers=min(NORMALIZE_WORKERS, len(files)),
+				mp_context=multiprocessing.get_context("spawn"),
+			) as pool:
+				normalized = pool.map(normalize_sentences, (sentences for _, sentences in files))
+
+				for (path, _), normalized_sentences in zip(files, normalized):
+					self.progress(len(results), len(files))
+					results.append((path, normalized_sentences))
+		else:
+			for path, sentences in files:
+				self.progress(len(results), len(files))
+				results.append((path, normalize_sentences(sentences)))
 
-			normalized_sentences = []
+		self.done(f"{sum(len(sentences) for _, sentences in results)} sentences normalized.")
 
-			for sentence in sentences:
-				normalized = normalize_sentence(sentence)
+		return Artifact(results)
 
-				if len(normalized) >= 5 and has_at_least_n_hiragana(normalized, 2):
-					normalized_sentences.append(normalized)
 
-			results.append((path, normalized_sentences))
+def normalize_sentences(sentences: list[str]) -> list[str]:
+	normalized_sentences = []
 
-		self.done(f"{sum(len(sentences) for _, sentences in results)} sentences normalized.")
+	for sentence in sentences:
+		normalized = normalize_sentence(sentence)
 
-		return Artifact(results)
+		if len(normalized) >= 5 and has_at_least_n_hiragana(normalized, 2):
+			normalized_sentences.append(normalized)
+
+	return normalized_sentences
 
 
 def normalize_sentence(text: str) -> str:
@@ -39,15 +80,12 @@ def normalize_sentence(text: str) -> str:
 	# text = _RE_JP_PUNCT_SPACES.sub(r"\1", text)
 
 	# unwanted characters
-	text = re.sub(r"→+", "", text)
+	text = _RE_ARROWS.sub("", text)
 
 	# remove script control HEX characters
-	text = re.sub(r"[A-F0-9]{2}\s", "", text)
-
-	unwanted_prefix_chars = {"×", ">", ")", "）", "∠", "*", "、", "＊", "▶", "・", "∨", "◎"}
+	text = _RE_HEX_CONTROL.sub("", text)
 
-	while text and text[0] in unwanted_prefix_chars:
-			text = text[1:]
+	text = text.lstrip(_UNWANTED_PREFIX_CHARS)
 
 	# remove opening and closing brackets and such
 	while True:
@@ -57,15 +95,15 @@ def normalize_sentence(text: str) -> str:
 		text = new_text
 
 	# limit any character to at most 3 copies
-	text = re.sub(r"(.)\1{3,}", r"\1\1\1", text)
-	text = re.sub(r"⋯+", "…", text)
-	text = re.sub(r"…+", "…", text)
-	text = re.sub(r"‥+", "…", text)
+	text = _RE_REPEATED_CHAR.sub(r"\1\1\1", text)
+	text = _RE_MIDLINE_ELLIPSIS.sub("…", text)
+	text = _RE_ELLIPSIS.sub("…", text)
+	text = _RE_TWO_DOT_LEADER.sub("…", text)
 
-	# normalize punctuation
-	text = re.sub(r"・・・", "…", text)
-	text = re.sub(r"～～～", "～", text)
-	text = re.sub(r"…。", "…", text)
+	# normalize punctuation (plain substrings, no regex needed)
+	text = text.replace("・・・", "…")
+	text = text.replace("～～～", "～")
+	text = text.replace("…。", "…")
 
 	return text
 
@@ -124,12 +162,6 @@ def contains_japanese_script(text: str) -> bool:
 
 
 def has_at_least_n_hiragana(text: str, n: int) -> bool:
-    count = 0
-
-    for c in text:
-        if "\u3040" <= c <= "\u309F":
-            count += 1
-            if count >= n:
-                return True
-
-    return False
\ No newline at end of file
+    # let the regex engine find the n-th hiragana instead of looping per char
+    nth = next(islice(_RE_HIRAGANA.finditer(text), max(n - 1, 0), None), None)
+    return nth is not None
\ No newline at end of file
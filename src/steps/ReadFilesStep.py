@@ -1,4 +1,6 @@
 from pathlib import Path
+import mmap
+import os
 
 from src.Artifact import Artifact
 from src.PipelineStep import PipelineStep
@@ -17,9 +19,31 @@ class ReadFilesStep(PipelineStep):
 
         for i, path in enumerate(files):
             self.progress(i, total, path.name)
-            text = path.read_text(encoding=self.encoding)
+            text = read_text_file(path, self.encoding)
             results.append((path, text))
 
         self.done(f"{len(results)} files found.")
 
-        return Artifact(results)
\ No newline at end of file
+        return Artifact(results)
+
+
+MMAP_MIN_SIZE = 1 << 20
+# Files at least this large are decoded straight from a memory map
+
+
+def read_text_file(path: Path, encoding: str = "utf-8") -> str:
+    # One read() and one C-level decode instead of read_text()'s buffered
+    # incremental decoding; newlines are normalized the way text mode would.
+    # Large files decode from a read-only mmap so the raw bytes are never
+    # copied onto the heap next to the decoded text.
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size >= MMAP_MIN_SIZE:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                text = str(m, encoding)
+        else:
+            text = f.read().decode(encoding)
+
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+
+    return text
\ No newline at end of file
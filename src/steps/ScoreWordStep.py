@@ -23,22 +23,41 @@ def score_words(input: dict, progress_handler=None) -> dict:
 
     max_frequency = max(stats.frequency for stats in input.values())
 
+    # loop invariants: the log of the max frequency, and one diversity
+    # factor per distinct tag count
+    log_max_frequency = math.log1p(max_frequency)
+    diversity_factors = {}
+
+    # report roughly every 1%; the final tick is always sent since it ends the step
+    progress_step = max(1, total_words // 100)
+
+    # tracked while scoring so normalization needs no separate max() pass
+    max_score = 0.0
+
     for i, stats in enumerate(input.values(), 1):
         score = calculate_score(
             stats.index,
             stats.frequency,
-            max_frequency
+            max_frequency,
+            log_max_frequency=log_max_frequency,
         )
 
-        score *= tag_diversity_factor(len(stats.tags))
+        tag_count = len(stats.tags)
+        factor = diversity_factors.get(tag_count)
+        if factor is None:
+            factor = diversity_factors[tag_count] = tag_diversity_factor(tag_count)
+
+        score *= factor
 
         stats.score = score
 
-        if progress_handler:
+        if score > max_score:
+            max_score = score
+
+        if progress_handler and (i % progress_step == 0 or i == total_words):
             progress_handler(i, total_words) #, f"{score}: [index={stats.index}/{max_index}; freq={stats.frequency}/{max_frequency}]\n")
 
     # Normalize so the top word always scores 1000
-    max_score = max(stats.score for stats in input.values())
     if max_score > 0:
         for stats in input.values():
             stats.score = round(stats.score / max_score * 1000, 2)
@@ -51,7 +70,8 @@ def calculate_score(
     frequency: int,
     max_frequency: int,
     w_freq: float = 0.7,
-    w_index: float = 0.3
+    w_index: float = 0.3,
+    log_max_frequency: float | None = None
 ) -> float:
     """
     index: mean normalized position across files (0.0 = start, 1.0 = end)
@@ -59,13 +79,17 @@ def calculate_score(
     max_frequency: max frequency in corpus
     w_freq: weight for frequency
     w_index: weight for position
+    log_max_frequency: precomputed log1p(max_frequency), when scoring many words
     """
 
     # index is already 0–1; invert so early words score higher
     index_score = (1 - index) ** 1.5
 
     # Log-scale frequency to spread out scores for common words
-    frequency_score = math.log1p(frequency) / math.log1p(max_frequency) if max_frequency > 0 else 0
+    if log_max_frequency is None:
+        log_max_frequency = math.log1p(max_frequency)
+
+    frequency_score = math.log1p(frequency) / log_max_frequency if max_frequency > 0 else 0
 
     # Weighted combination
     return w_freq * frequency_score + w_index * index_score
@@ -1,6 +1,13 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
 import appdirs
+import os
 import re
+import sys
+import threading
+import time
 
 from sudachipy import dictionary, tokenizer as sudachi_tokenizer
 
@@ -8,6 +15,7 @@ from src.Artifact import Artifact
 from src.PipelineStep import PipelineStep
 from src.steps.ProcessingStep import ProcessingStep
 from src.SegmentedSentence import SegmentedSentence
+from src.steps.FilterFrequencyStep import filter_useful_words
 from src.TokenCache import TokenCache
 from src.WordStats import WordStats
 
@@ -17,11 +25,23 @@ from src.WordStats import WordStats
 # -------------------------------------------------------------------
 
 RE_TAG = re.compile(r"\[(.+?)\]")
-RE_SMALL_KANA_END = re.compile(r"[っゃゅょァィゥェォッャュョー]+$")
-RE_ALL_DIGITS = re.compile(r"^\d+$")
-RE_ALL_LATIN = re.compile(r"^[a-zA-ZÀ-ÿ\-']+$")
-
-SKIP_POS1 = {
+RE_DIGITS_OR_LATIN = re.compile(r"^(?:\d+|[a-zA-ZÀ-ÿ\-']+)$")
+RE_KANA_NOISE = re.compile(r"[ぁ-ん]|[ァ-ンー]+")
+# fullmatch: a single hiragana, or katakana only (no kanji)
+RE_ALL_HIRAGANA = re.compile(r"[ぁ-ゖー]+")
+RE_JAPANESE_SCRIPT = re.compile(
+    "[\u3040-\u309F"   # Hiragana
+    "\u30A0-\u30FF"    # Katakana
+    "\u4E00-\u9FFF]"   # Kanji
+)
+RE_GUIDE_HEADER = re.compile(r"^[ぁ-んァ-ン一-龯]+[　\s]+[A-ZＭＳLR]([　\s]|$)")
+
+GUIDE_LABELS = ("行き方", "入手方法", "戦闘開始時")
+
+SMALL_KANA_END = frozenset("っゃゅょァィゥェォッャュョー")
+# Lemmas ending in one of these are truncated forms
+
+SKIP_POS1 = frozenset({
     "助詞",
     "記号",
     "補助記号",
@@ -29,33 +49,82 @@ SKIP_POS1 = {
     "接頭辞",
     "接尾辞",
     "代名詞",
-}
+})
 
-SKIP_POS1_POS2 = {
+SKIP_POS1_POS2 = frozenset({
     ("名詞", "固有名詞"),
     ("名詞", "代名詞"),
     ("感動詞", "フィラー"),
-}
+})
 
-TOKENIZER_FINGERPRINT = "sudachidict_full+user_dict.C+postproc-v1.2026/06/11.2"
+TOKENIZER_FINGERPRINT = "sudachidict_full+user_dict.C+postproc-v1.2026/10/15.2"
 TOKENIZER_MODE = sudachi_tokenizer.Tokenizer.SplitMode.C
 
+# Katakana range (ァ..ヶ) → Hiragana, applied with str.translate
+KATA_TO_HIRA = {code: code - 0x60 for code in range(0x30A1, 0x30F7)}
+
+PROGRESS_INTERVAL = 0.05
+# Minimum seconds between progress updates while tokenizing
+
 MIN_SENTENCE_LENGTH = 10
 MAX_SENTENCE_LENGTH = 50
 
-_tokenizer = None
+SUDACHI_MAX_BYTES = 49149
+# Sudachi rejects inputs longer than this many UTF-8 bytes
+
+TOKENIZE_WORKERS = os.cpu_count() or 1
+# Threads used to run Sudachi over sentence batches
+
+TOKENIZE_BATCH_SIZE = 500
+# Upper bound on sentences per tokenizer batch
+
+TOKENIZE_MIN_BATCH_SIZE = 50
+# Lower bound on sentences per batch; smaller files are a single batch
+# Files in between are split evenly so one file still keeps every worker busy
+
+_dictionary = None
+_dictionary_lock = threading.Lock()
+_thread_state = threading.local()
+_executor = None
+
+
+def get_dictionary():
+    global _dictionary
+
+    # loaded once per process; only the first callers contend for the lock
+    if _dictionary is None:
+        with _dictionary_lock:
+            if _dictionary is None:
+                _dictionary = dictionary.Dictionary(
+                    config_path="resources/sudachi.json",
+                    dict="full"
+                )
+
+    return _dictionary
 
 
 def get_tokenizer():
-    global _tokenizer
+    # Sudachi tokenizers can't be shared between threads, so each thread
+    # gets its own, all backed by the one loaded dictionary.
+    tokenizer = getattr(_thread_state, "tokenizer", None)
+
+    if tokenizer is None:
+        tokenizer = _thread_state.tokenizer = get_dictionary().create()
+
+    return tokenizer
 
-    if _tokenizer is None:
-        _tokenizer = dictionary.Dictionary(
-            config_path="resources/sudachi.json",
-            dict="full"
-        ).create()
-    
-    return _tokenizer
+
+def get_executor():
+    global _executor
+
+    if _executor is None:
+        # each worker builds its tokenizer as it starts, not inside its first batch
+        _executor = ThreadPoolExecutor(
+            max_workers=TOKENIZE_WORKERS,
+            initializer=get_tokenizer,
+        )
+
+    return _executor
 
 
 # -------------------------------------------------------------------
@@ -63,8 +132,11 @@ def get_tokenizer():
 # -------------------------------------------------------------------
 
 class TokenizeStep(PipelineStep):
-    def __init__(self):
+    def __init__(self, min_frequency: int | None = None):
         self._processing_step = ProcessingStep.TOKENIZING
+        # when set, the frequency filter runs here on the merged word data
+        # instead of as a separate FilterFrequencyStep
+        self.min_frequency = min_frequency
 
 
     def process(self, artifact: Artifact) -> Artifact:
@@ -75,6 +147,10 @@ class TokenizeStep(PipelineStep):
             tokenizer_fingerprint=TOKENIZER_FINGERPRINT,
         ) if artifact.tmpdir else None
 
+        if cache:
+            _lemma_reading_cache.update(cache.load_lemma_readings())
+        known_readings = len(_lemma_reading_cache)
+
         self.combined_tokens = {}
         combined_sentences = []
 
@@ -82,8 +158,9 @@ class TokenizeStep(PipelineStep):
         self.current_file = None
         self.sentence_offset = 0
         self.total_sentences = sum(len(sentences) for _, sentences in files)
+        self._last_progress_t = 0.0
 
-        for path, sentences in files:
+        for path, sentences, prefetched, mtime_ns, cached_hash in self._prefetch(files, cache):
             self.current_file = path
             tag = RE_TAG.search(str(path))
             tag = tag.group(1) if tag else "[no tag]"
@@ -95,6 +172,9 @@ class TokenizeStep(PipelineStep):
                 tag=tag,
                 cache=cache,
                 source_path=path,
+                mtime_ns=mtime_ns,
+                cached_hash=cached_hash,
+                prefetched=prefetched,
                 progress_handler=self._file_progress,
             )
 
@@ -104,14 +184,66 @@ class TokenizeStep(PipelineStep):
         if cache:
             cache.flush_mtime_index()
 
+            if len(_lemma_reading_cache) != known_readings:
+                cache.save_lemma_readings(_lemma_reading_cache)
+
+        if self.min_frequency is None:
+            self.done(
+                f'{self.total_tokens} tokens and {len(combined_sentences)} sentences collected.'
+            )
+
+            return Artifact(self.combined_tokens, sentences=combined_sentences)
+
+        kept = filter_useful_words(self.combined_tokens, min_frequency=self.min_frequency)
+
         self.done(
-            f'{self.total_tokens} tokens and {len(combined_sentences)} sentences collected.'
+            f'{self.total_tokens} tokens and {len(combined_sentences)} sentences collected, '
+            f'{len(kept)} kept.'
         )
 
-        return Artifact(self.combined_tokens, sentences=combined_sentences)
+        return Artifact(kept, sentences=combined_sentences)
+
+
+    def _prefetch(self, files, cache):
+        """
+        Yield (path, sentences, futures, mtime_ns, cached_hash) in input
+        order, with the batches of upcoming files already queued on the
+        tokenizer pool so workers never idle between files. Cache hits get
+        no futures; the mtime and hash are passed on so tokenize() doesn't
+        stat the file and probe the index a second time.
+        """
+        # without a pool nothing is queued ahead, so files go straight through
+        window = TOKENIZE_WORKERS * 2 if TOKENIZE_WORKERS > 1 else 0
+        pending = deque()
+
+        for path, sentences in files:
+            mtime_ns = cached_hash = None
+
+            if cache:
+                mtime_ns = path.stat().st_mtime_ns
+                cached_hash = cache.get_hash_by_mtime(path, mtime_ns)
+
+            futures = None
+
+            if window and not cached_hash:
+                futures = submit_tokenize(sentences)
+
+            pending.append((path, sentences, futures, mtime_ns, cached_hash))
+
+            # keep a bounded window in flight so finished columns don't pile up
+            if len(pending) > window:
+                yield pending.popleft()
+
+        while pending:
+            yield pending.popleft()
 
 
     def _file_progress(self, current, total, message=""):
+        now = time.monotonic()
+        if now - self._last_progress_t < PROGRESS_INTERVAL:
+            return
+        self._last_progress_t = now
+
         self.progress(
             self.sentence_offset + current,
             self.total_sentences,
@@ -130,6 +262,9 @@ def tokenize(
     tag=None,
     cache=None,
     source_path=None,
+    mtime_ns=None,
+    cached_hash=None,
+    prefetched=None,
     progress_handler=None
 ):
     if not isinstance(input_path, list):
@@ -137,60 +272,83 @@ def tokenize(
 
     sentences_text = input_path
 
-    tokenizer_obj = get_tokenizer()
-
     word_data = word_data or {}
     segmented_out = list(segmented_sentences) if segmented_sentences else []
 
     # ── Cache fast path ───────────────────────────────────────────
-    all_sentence_tokens = None  # list[list[dict]], one per sentence
+    columns = None  # per-token parallel lists, see tokenize_sentences()
 
     if cache and source_path:
-        mtime_ns = source_path.stat().st_mtime_ns
-        hash_ = cache.get_hash_by_mtime(source_path, mtime_ns)
-        if hash_:
-            payload = cache.load_by_hash(hash_)
+        # TokenizeStep passes in the mtime and hash it already looked up
+        if mtime_ns is None:
+            mtime_ns = source_path.stat().st_mtime_ns
+            cached_hash = cache.get_hash_by_mtime(source_path, mtime_ns)
+
+        if cached_hash:
+            payload = cache.load_by_hash(cached_hash)
             if payload:
-                all_sentence_tokens = payload["tokens"]  # cheap dicts only
+                columns = payload["tokens"]
+
+                # unpickled strings are only shared within one file; intern
+                # them so every file probes word_data with the same objects
+                intern = sys.intern
+                columns["surfaces"] = list(map(intern, columns["surfaces"]))
+                columns["lemmas"] = list(map(intern, columns["lemmas"]))
 
     # ── Tokenize (only if cache missed) ──────────────────────────
-    if all_sentence_tokens is None:
-        all_sentence_tokens = [
-            [sudachi_node_to_dict(m) for m in tokenizer_obj.tokenize(s, TOKENIZER_MODE)]
-            for s in sentences_text
-        ]
+    if columns is None:
+        if prefetched is not None:
+            columns = merge_columns(f.result() for f in prefetched)
+        else:
+            columns = tokenize_sentences(sentences_text)
         if cache and source_path:
             cache.put_by_mtime(
                 source_path,
                 mtime_ns,
-                "\n".join(sentences_text),
-                all_sentence_tokens,
+                sentences_text,
+                columns,
             )
 
+    sentence_ends = columns["sentence_ends"]
+
+    # One pass over the columns in lockstep; each sentence takes the next
+    # (end - start) tokens, so no per-field indexing is needed
+    token_rows = zip(
+        columns["surfaces"],
+        columns["lemmas"],
+        columns["readings"],
+        columns["pos"],
+    )
+
     # ── Merge tokens into word_data + segmented_out ───────────────
     lemma_first_pos_in_file: dict[str, int] = {}
+    # WordStats of those lemmas, in the same (insertion) order, so the index
+    # update below can zip the two instead of looking each lemma up again
+    words_in_file: list[WordStats] = []
     token_index = 0
+    start = 0
 
-    for i, (sentence, token_list) in enumerate(zip(sentences_text, all_sentence_tokens)):
+    # Local bindings (hot path)
+    useless = is_useless
+    word_get = word_data.get
+    first_pos_in_file = lemma_first_pos_in_file
+    append_sentence = segmented_out.append
+    append_word_in_file = words_in_file.append
+
+    for i, (sentence, end) in enumerate(zip(sentences_text, sentence_ends)):
         if progress_handler and i % 200 == 0:
-            progress_handler(i, len(all_sentence_tokens))
+            progress_handler(i, len(sentence_ends))
 
         sentence_surfaces = {}
 
-        for token in token_list:
-            lemma = token["base_form"] or token["lemma"]
-            reading = token["reading"]
-
-            if not lemma or not reading or is_useless(token):
+        for surface, lemma, reading, pos in islice(token_rows, end - start):
+            if not reading or useless(lemma, pos):
                 continue
 
             token_index += 1
-            if lemma not in lemma_first_pos_in_file:
-                lemma_first_pos_in_file[lemma] = token_index
+            sentence_surfaces[lemma] = surface
 
-            sentence_surfaces[lemma] = token["surface"]
-
-            ws = word_data.get(lemma)
+            ws = word_get(lemma)
 
             if ws:
                 ws.frequency += 1
@@ -200,21 +358,28 @@ def tokenize(
                     0,            # index_count: no files contributed yet
                     1,            # frequency
                     0.0,          # score
-                    kata_to_hira(reading),
+                    reading,      # already hiragana, see get_lemma_reading()
                     "",
                     set(),
                     [],
                     lemma,
-                    token["pos"],
+                    pos,
                     invalid=False,
                 )
                 word_data[lemma] = ws
 
-            if tag:
-                ws.tags.add(tag)
+            # the tag is the same for the whole file, so it only needs
+            # adding the first time a lemma shows up in it
+            if lemma not in first_pos_in_file:
+                first_pos_in_file[lemma] = token_index
+                append_word_in_file(ws)
+                if tag:
+                    ws.tags.add(tag)
+
+        start = end
 
         if is_valid_sentence(sentence):
-            segmented_out.append(
+            append_sentence(
                 SegmentedSentence(
                     text=sentence,
                     tag=tag,
@@ -228,8 +393,7 @@ def tokenize(
     # count of this file (0 = first token, 1 = last token), then folded
     # into a running mean across all files processed so far.
     if token_index > 0:
-        for lemma, first_pos in lemma_first_pos_in_file.items():
-            ws = word_data[lemma]
+        for ws, first_pos in zip(words_in_file, lemma_first_pos_in_file.values()):
             file_norm_pos = first_pos / token_index
             ws.index = (ws.index * ws.index_count + file_norm_pos) / (ws.index_count + 1)
             ws.index_count += 1
@@ -241,102 +405,206 @@ _lemma_reading_cache = {}
 
 
 def get_lemma_reading(lemma: str) -> str:
-    if lemma in _lemma_reading_cache:
-        return _lemma_reading_cache[lemma]
-
-    m = get_tokenizer().tokenize(lemma, TOKENIZER_MODE)[0]
-    reading = kata_to_hira(m.reading_form())
+    reading = _lemma_reading_cache.get(lemma)
+    if reading is not None:
+        return reading
+
+    # hiragana-only lemmas are their own reading, and ASCII lemmas are dropped
+    # as noise anyway; neither needs a trip through the tokenizer
+    if lemma.isascii():
+        reading = ""
+    elif RE_ALL_HIRAGANA.fullmatch(lemma):
+        reading = lemma
+    else:
+        m = get_tokenizer().tokenize(lemma, TOKENIZER_MODE)[0]
+        reading = kata_to_hira(m.reading_form())
 
     _lemma_reading_cache[lemma] = reading
     return reading
 
 
-def sudachi_node_to_dict(m) -> dict:
-    surface = m.surface()
-    lemma = m.dictionary_form() or surface
-    reading = get_lemma_reading(lemma)
+_pos_cache = {}
+
+
+def get_pos(m) -> tuple[str, ...]:
+    # The dictionary only has a few thousand POS tags; hand out one shared
+    # tuple per tag id instead of keeping a fresh 6-tuple for every token
+    pos_id = m.part_of_speech_id()
+    pos = _pos_cache.get(pos_id)
+
+    if pos is None:
+        pos = _pos_cache[pos_id] = tuple(m.part_of_speech())
+
+    return pos
+
+
+def tokenize_sentences(sentences_text: list[str]) -> dict:
+    """
+    Tokenize every sentence into struct-of-arrays columns: one flat list per
+    token field, plus the end offset of each sentence in those lists.
+
+    Large inputs are split into batches that run on the tokenizer thread
+    pool; results are merged back in sentence order.
+    """
+    if TOKENIZE_WORKERS <= 1 or len(sentences_text) <= TOKENIZE_MIN_BATCH_SIZE:
+        return _tokenize_batch(sentences_text)
+
+    return merge_columns(f.result() for f in submit_tokenize(sentences_text))
+
+
+def submit_tokenize(sentences_text: list[str]) -> list:
+    # Aim for one batch per worker, clamped so batches are neither too small
+    # to be worth a task nor so large that the tail of a file runs alone
+    per_worker = -(-len(sentences_text) // TOKENIZE_WORKERS)
+    size = max(TOKENIZE_MIN_BATCH_SIZE, min(TOKENIZE_BATCH_SIZE, per_worker))
+    executor = get_executor()
+
+    return [
+        executor.submit(_tokenize_batch, sentences_text[i:i + size])
+        for i in range(0, len(sentences_text), size)
+    ] or [executor.submit(_tokenize_batch, sentences_text)]
+
+
+def merge_columns(batches) -> dict:
+    columns = None
+
+    for batch_columns in batches:
+        if columns is None:
+            columns = batch_columns
+            continue
+
+        offset = len(columns["surfaces"])
+        columns["surfaces"].extend(batch_columns["surfaces"])
+        columns["lemmas"].extend(batch_columns["lemmas"])
+        columns["readings"].extend(batch_columns["readings"])
+        columns["pos"].extend(batch_columns["pos"])
+        columns["sentence_ends"].extend(end + offset for end in batch_columns["sentence_ends"])
+
+    return columns
+
+
+def _tokenize_batch(sentences_text: list[str]) -> dict:
+    tokenize = get_tokenizer().tokenize
+    mode = TOKENIZER_MODE
+    intern = sys.intern
+    sudachi_chunks = iter_sudachi_chunks
+    # lemmas repeat constantly, so the reading memo is probed inline and
+    # get_lemma_reading() is only called for a lemma not seen before
+    reading_get = _lemma_reading_cache.get
+
+    surfaces = []
+    lemmas = []
+    readings = []
+    pos_tags = []
+    sentence_ends = []
+
+    for s in sentences_text:
+        for chunk in sudachi_chunks(s):
+            for m in tokenize(chunk, mode):
+                # Interned so repeated lemmas share one object: dict/set lookups
+                # short-circuit on identity and the cache pickle stores each once
+                surface = intern(m.surface())
+                lemma = intern(m.dictionary_form() or surface)
+
+                surfaces.append(surface)
+                lemmas.append(lemma)
+                reading = reading_get(lemma)
+                if reading is None:
+                    reading = get_lemma_reading(lemma)
+
+                readings.append(reading)
+                pos_tags.append(get_pos(m))
+
+        sentence_ends.append(len(surfaces))
 
     return {
-        "surface": surface,
-        "lemma": lemma,
-        "base_form": lemma,
-        "reading": kata_to_hira(reading),
-        "pos": m.part_of_speech(),
+        "surfaces": surfaces,
+        "lemmas": lemmas,
+        "readings": readings,
+        "pos": pos_tags,
+        "sentence_ends": sentence_ends,
     }
 
 
+def iter_sudachi_chunks(text: str, max_bytes: int = SUDACHI_MAX_BYTES):
+    # UTF-8 needs at most 4 bytes per code point, so almost every sentence
+    # is known to fit without encoding it; those come back as a 1-tuple,
+    # without a generator per sentence, and only oversized ones get split
+    if len(text) * 4 <= max_bytes:
+        return (text,)
+
+    return split_text_by_utf8_bytes(text, max_bytes)
+
+
+def split_text_by_utf8_bytes(text: str, max_bytes: int):
+    # a chunk must fit at least one whole UTF-8 sequence, or the back-off
+    # below would never advance
+    if max_bytes < 4:
+        raise ValueError(f"max_bytes must be at least 4, got {max_bytes}")
+
+    data = text.encode("utf-8")
+    start = 0
+
+    while start < len(data):
+        end = min(start + max_bytes, len(data))
+
+        # back off to the start of a UTF-8 sequence
+        while end < len(data) and data[end] & 0xC0 == 0x80:
+            end -= 1
+
+        yield data[start:end].decode("utf-8")
+        start = end
+
+
 def kata_to_hira(text: str) -> str:
     if not text:
         return ""
 
-    result = []
-    for ch in text:
-        code = ord(ch)
-        # Katakana range → Hiragana
-        if 0x30A1 <= code <= 0x30F6:
-            ch = chr(code - 0x60)
-        result.append(ch)
+    return text.translate(KATA_TO_HIRA)
 
-    return "".join(result)
 
+_lemma_noise_cache = {}
 
-def is_useless(token: dict) -> bool:
-    lemma = token["base_form"] or token["lemma"]
 
+def is_useless(lemma: str, pos: tuple[str, ...]) -> bool:
     # skip very short kana noise
     if not lemma:
         return True
 
-    # bare numbers (digits only, including Arabic numerals in Japanese text)
-    if RE_ALL_DIGITS.match(lemma):
-        return True
+    # punctuation and other skipped POS are the most common rejects;
+    # test them before the lemma checks
+    pos1 = pos[0]
 
-    # pure Latin words — these are not Japanese vocabulary
-    if RE_ALL_LATIN.match(lemma):
+    if pos1 in SKIP_POS1 or (pos1, pos[1]) in SKIP_POS1_POS2:
         return True
 
-    # no Japanese script at all — symbols, punctuation clusters, emoticons, etc.
-    if not contains_japanese_script(lemma):
-        return True
+    # the remaining checks only look at the lemma, which repeats constantly
+    noise = _lemma_noise_cache.get(lemma)
+    if noise is None:
+        noise = _lemma_noise_cache[lemma] = is_noise_lemma(lemma)
 
-    if lemma[-1] in ("っ", "ッ", "ー"):
-        return True
-
-    pos1, pos2, *_ = token["pos"]
+    return noise
 
-    if pos1 in SKIP_POS1:
-        return True
 
-    if (pos1, pos2) in SKIP_POS1_POS2:
+def is_noise_lemma(lemma: str) -> bool:
+    # bare numbers (digits only, including Arabic numerals in Japanese text)
+    # and pure Latin words — these are not Japanese vocabulary
+    if RE_DIGITS_OR_LATIN.match(lemma):
         return True
 
-    # small kana endings (truncated forms)
-    if RE_SMALL_KANA_END.search(lemma):
+    # no Japanese script at all — symbols, punctuation clusters, emoticons, etc.
+    if not contains_japanese_script(lemma):
         return True
 
-    # single kana noise
-    if len(lemma) == 1:
-        c = lemma[0]
-        if "ぁ" <= c <= "ん" or "ァ" <= c <= "ン":
-            return True
-
-    # katakana-heavy noise detection
-    all_katakana = True
-    has_kanji = False
-
-    for c in lemma:
-        if "一" <= c <= "龯":
-            has_kanji = True
-        if not ("ァ" <= c <= "ン" or c == "ー"):
-            all_katakana = False
-
-    if all_katakana and not has_kanji:
+    # small kana / long vowel endings (truncated forms)
+    if lemma[-1] in SMALL_KANA_END:
         return True
 
-    return False
+    # single kana noise and katakana-heavy noise (no kanji at all)
+    return RE_KANA_NOISE.fullmatch(lemma) is not None
 
 
-def is_japanese_char(c: str) -> bool:
+def _is_japanese_char_slow(c: str) -> bool:
     return (
         "\u3040" <= c <= "\u309F"   # Hiragana
         or "\u30A0" <= c <= "\u30FF"  # Katakana
@@ -350,7 +618,29 @@ def is_japanese_char(c: str) -> bool:
     )
 
 
+# One byte per BMP code point (1 = counts as Japanese sentence text),
+# precomputed from the predicate above so lookups are a single index.
+JAPANESE_CHAR_TABLE = bytes(_is_japanese_char_slow(chr(cp)) for cp in range(0x10000))
+
+# str.translate table that deletes every BMP Japanese character, so a
+# whole sentence is counted in one C-level pass. Code points past the BMP
+# raise IndexError, which translate treats as "leave unchanged".
+DROP_JAPANESE_CHARS = [None if is_jp else cp for cp, is_jp in enumerate(JAPANESE_CHAR_TABLE)]
+
+
+def is_japanese_char(c: str) -> bool:
+    cp = ord(c)
+    if cp < 0x10000:
+        return JAPANESE_CHAR_TABLE[cp] == 1
+    return _is_japanese_char_slow(c)
+
+
 def is_valid_sentence(text: str) -> bool:
+    # the length bound is free to test and rejects most long prose lines
+    # before any of the per-character scans below
+    if not MIN_SENTENCE_LENGTH <= len(text) <= MAX_SENTENCE_LENGTH:
+        return False
+
     if not contains_japanese_script(text):
         return False
 
@@ -360,33 +650,31 @@ def is_valid_sentence(text: str) -> bool:
     if text.count("[...]") > 2:
         return False
 
-    japanese_chars = sum(1 for c in text if is_japanese_char(c))
-    visible_chars = sum(1 for c in text if not c.isspace())
+    rest = text.translate(DROP_JAPANESE_CHARS)
+    japanese_chars = len(text) - len(rest)
 
-    if visible_chars and japanese_chars / visible_chars < 0.55:
-        return False
+    # characters past the BMP (emoji, rare kanji) survive translate; test them directly
+    if rest and max(rest) > "\uffff":
+        japanese_chars += sum(_is_japanese_char_slow(c) for c in rest if c > "\uffff")
 
-    return MIN_SENTENCE_LENGTH <= len(text) <= MAX_SENTENCE_LENGTH
+    # str.split() drops exactly the characters str.isspace() matches
+    visible_chars = len("".join(text.split()))
+
+    return not visible_chars or japanese_chars / visible_chars >= 0.55
 
 
 def contains_japanese_script(text: str) -> bool:
-    return any(
-        "\u3040" <= c <= "\u309F"  # Hiragana
-        or "\u30A0" <= c <= "\u30FF"  # Katakana
-        or "\u4E00" <= c <= "\u9FFF"  # Kanji
-        for c in text
-    )
+    return RE_JAPANESE_SCRIPT.search(text) is not None
 
 
 def looks_like_guide_header(text: str) -> bool:
     # structural header pattern: Japanese + control letter fragment
-    if re.search(r"^[ぁ-んァ-ン一-龯]+[　\s]+[A-ZＭＳLR]([　\s]|$)", text):
+    if RE_GUIDE_HEADER.search(text):
         return True
 
     # only flag guide terms when they appear to be the whole sentence
     # (no verb, very short, looks like a label)
-    guide_labels = ("行き方", "入手方法", "戦闘開始時")
-    if any(term in text for term in guide_labels) and len(text) < 20:
+    if len(text) < 20 and any(term in text for term in GUIDE_LABELS):
         return True
 
     return False
\ No newline at end of file
@@ -1,5 +1,7 @@
 import csv
 
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from src.Artifact import Artifact
@@ -16,6 +18,16 @@ class WriteOutputStep(PipelineStep):
         return artifact
 
 
+# Large write buffer so the output goes out in a few big writes
+WRITE_BUFFER_SIZE = 1 << 20
+
+WRITE_CHUNK_WORDS = 5000
+# Words whose rows are collected before each batch of writerows() calls
+
+WRITE_QUEUE_DEPTH = 2
+# Row batches allowed to wait on the writer thread before row building pauses
+
+
 def write_final_file(input, output_file, progress_handler=None):
     p = output_file
 
@@ -25,55 +37,96 @@ def write_final_file(input, output_file, progress_handler=None):
         reverse=True                  # highest score first
     )
 
-    sorted_words_by_score = dict(sorted_items)
+    normal_rows = []
+    drop_rows = []
+    sentence_rows = [["status", "word", "score", "sentence", "tag", "origin", "surface_form"]]
+
+    # most words share one of a handful of tag sets (tags come from file
+    # names), so each distinct set is sorted and joined only once
+    tag_strings: dict[frozenset, str] = {}
 
     with (
-        open(p, "w", encoding="utf-8", newline="") as outfile,
-        open(p.with_name(p.stem + ".dropped" + p.suffix), "w", encoding="utf-8", newline="") as dropfile
+        open(p, "w", encoding="utf-8", newline="", buffering=WRITE_BUFFER_SIZE) as outfile,
+        open(p.with_name(p.stem + ".dropped" + p.suffix), "w", encoding="utf-8", newline="", buffering=WRITE_BUFFER_SIZE) as dropfile,
+        open(p.with_name(p.stem + ".sentence" + p.suffix), 'w', encoding='utf-8', newline="", buffering=WRITE_BUFFER_SIZE) as sentence_file,
+        ThreadPoolExecutor(max_workers=1) as writer
     ):
-        normal_writer = csv.writer(outfile)
-        drop_writer = csv.writer(dropfile)
-
-        for word in sorted_words_by_score:
-            word_data = sorted_words_by_score[word]
-
-            writer = drop_writer if word_data.invalid else normal_writer
-
-            writer.writerow([
+        # rows are buffered per file and handed to writerows() in chunks,
+        # so memory stays bounded no matter how many words there are
+        outputs = (
+            (normal_rows, csv.writer(outfile).writerows),
+            (drop_rows, csv.writer(dropfile).writerows),
+            (sentence_rows, csv.writer(sentence_file).writerows),
+        )
+
+        # csv encoding and the disk writes happen on the writer thread while
+        # this one keeps building rows; a single worker keeps batches in order
+        pending = deque()
+
+        def submit_batch():
+            if len(pending) >= WRITE_QUEUE_DEPTH:
+                pending.popleft().result()
+
+            pending.append(writer.submit(
+                _write_batches,
+                [(writerows, buffered[:]) for buffered, writerows in outputs],
+            ))
+
+            for buffered, _ in outputs:
+                buffered.clear()
+
+        # one pass over the sorted words fills all three files' rows
+        for i, (word, word_data) in enumerate(sorted_items, 1):
+            rows = drop_rows if word_data.invalid else normal_rows
+
+            tag_key = frozenset(word_data.tags)
+            tags = tag_strings.get(tag_key)
+            if tags is None:
+                tags = tag_strings[tag_key] = " ".join(sorted(tag_key))
+
+            rows.append([
                 word_data.score,
                 word,
                 word_data.reading,
                 f"{word_data.index:.2f}",
                 word_data.frequency,
                 word_data.definition,
-                " ".join(sorted(word_data.tags)),
+                tags,
                 f"sentences: {len(word_data.sentences)}",
                 "<br><br>".join(
                     s.to_html() for s in word_data.sentences
                 ) if word_data.sentences else "no sentences :("
             ])
 
-    p = output_file
-    with open(p.with_name(p.stem + ".sentence" + p.suffix), 'w', encoding='utf-8', newline="") as sentence_file:
-        sentence_writer = csv.writer(sentence_file)
-        sentence_writer.writerow(["status", "word", "score", "sentence", "tag", "origin", "surface_form"])
-
-        for word, word_data in sorted_words_by_score.items():
-            if not word_data.sentences:
-                continue
-
-            status = "dropped" if word_data.invalid else "kept"
-
-            for sentence in word_data.sentences:
-                sentence_writer.writerow([
-                    status,
-                    word,
-                    word_data.score,
-                    sentence.text,
-                    sentence.tag,
-                    sentence.origin,
-                    sentence.surface_form,
-                ])
+            if word_data.sentences:
+                status = "dropped" if word_data.invalid else "kept"
+
+                sentence_rows.extend(
+                    [
+                        status,
+                        word,
+                        word_data.score,
+                        sentence.text,
+                        sentence.tag,
+                        sentence.origin,
+                        sentence.surface_form,
+                    ]
+                    for sentence in word_data.sentences
+                )
+
+            if i % WRITE_CHUNK_WORDS == 0:
+                submit_batch()
+
+        submit_batch()
+
+        # surfaces any write error before the files are closed
+        while pending:
+            pending.popleft().result()
 
     if progress_handler:
         progress_handler(1, 1, f'Output written to {Path(output_file).resolve()}.')
+
+
+def _write_batches(batches):
+    for writerows, rows in batches:
+        writerows(rows)
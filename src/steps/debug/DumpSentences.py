@@ -19,10 +19,9 @@ class DumpSentences(PipelineStep):
 		    for path, sentences in artifact.data:
 		        f.write(f"### {path}\n")
 
-		        for sentence in sentences:
-		            sentence = sentence.strip()
-		            if sentence:
-		                f.write(sentence + "\n")
+		        # one write per file instead of one per sentence
+		        stripped = (sentence.strip() for sentence in sentences)
+		        f.write("".join(f"{sentence}\n" for sentence in stripped if sentence))
 
 		        f.write("\n\n------------------------\n\n")  # separator between files
 
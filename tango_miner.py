@@ -3,11 +3,10 @@
 import argparse
 from pathlib import Path
 import sys
+import time
 from tempfile import TemporaryDirectory
-from os import path
 
 from src.Artifact import Artifact
-from src.Column import Column
 from src.Pipeline import Pipeline
 
 from src.steps.AddDefinitionsStep import AddDefinitionsStep
@@ -20,7 +19,6 @@ from src.steps.ProcessingStep import ProcessingStep
 from src.steps.ReadFilesStep import ReadFilesStep
 from src.steps.ScoreWordStep import ScoreWordStep
 from src.steps.TokenizeStep import TokenizeStep
-from src.steps.FilterFrequencyStep import FilterFrequencyStep
 from src.steps.WriteOutputStep import WriteOutputStep
 
 from src.steps.debug.DumpSentences import DumpSentences
@@ -29,35 +27,44 @@ from src.steps.debug.DumpSentences import DumpSentences
 MIN_FREQUENCY_DEFAULT = 4
 
 
-print_debug = lambda *a: None
+DEBUG = False
+# Debug output is guarded with `if DEBUG:` so its messages aren't even
+# formatted when it's off
 
 
 def enable_debug_logging():
-    global print_debug
-    print_debug = print
+    global DEBUG
+    DEBUG = True
 
 
 _LAST_LEN = 0
+_LAST_UPDATE = 0.0
+
+PROGRESS_UPDATE_INTERVAL = 1 / 30
+# Minimum seconds between in-place progress lines; "done" lines always print
+
+# Built once; print_step_progress runs on every progress event
+STEP_TEXT = {
+    ProcessingStep.TOKENIZING: "Tokenizing",
+    ProcessingStep.FILTERING: "Filtering useful vocab",
+    ProcessingStep.READINGS: "Adding readings",
+    ProcessingStep.DEFINITIONS: "Adding definitions",
+    ProcessingStep.SCORING: "Calculating scores",
+    ProcessingStep.SENTENCES: "Adding sentences",
+    ProcessingStep.ANKI_EXPORT: "Sending words to Anki",
+    ProcessingStep.SENTENCE_EXTRACTION: "Extracting sentences",
+    ProcessingStep.SENTENCE_NORMALIZATION: "Normalizing sentences",
+    ProcessingStep.READ_FILES: "Reading files"
+}
 
 def print_step_progress(step, amount, total, duration=None, additional_text=""):
     if step is None:
         print(additional_text)
         return
 
-    step_text = {
-        step.TOKENIZING: "Tokenizing",
-        step.FILTERING: "Filtering useful vocab",
-        step.READINGS: "Adding readings",
-        step.DEFINITIONS: "Adding definitions",
-        step.SCORING: "Calculating scores",
-        step.SENTENCES: "Adding sentences",
-        step.ANKI_EXPORT: "Sending words to Anki",
-        step.SENTENCE_EXTRACTION: "Extracting sentences",
-        step.SENTENCE_NORMALIZATION: "Normalizing sentences",
-        step.READ_FILES: "Reading files"
-    }
-
-    text = step_text[step] if step in step_text else "???"
+    global _LAST_UPDATE
+
+    text = STEP_TEXT.get(step, "???")
 
     if amount >= total:
         if duration is not None:
@@ -65,6 +72,13 @@ def print_step_progress(step, amount, total, duration=None, additional_text=""):
         else:
             _print_progress_line(f"{text}... done. {additional_text}", newline=True)
     else:
+        # each line is a write + flush to the terminal; skip updates that
+        # arrive faster than anyone could read them
+        now = time.monotonic()
+        if now - _LAST_UPDATE < PROGRESS_UPDATE_INTERVAL:
+            return
+        _LAST_UPDATE = now
+
         percent = f"{amount / total:.1%}"
         _print_progress_line(f"{text}... {percent} {additional_text}", newline=False)
 
@@ -112,20 +126,23 @@ def process_script():
         enable_debug_logging()
 
     print(f'Min frequency: {min_frequency}')
-    print_debug('debug = true')
-    print_debug(f'recursive mode = {recursive}')
+    if DEBUG:
+        print('debug = true')
+        print(f'recursive mode = {recursive}')
 
     with TemporaryDirectory() as tmpdir_str:
         tmpdir = Path(tmpdir_str)
         input_path_obj = Path(input_path)
 
-        print_debug(f"tmp dir: {tmpdir}")
+        if DEBUG:
+            print(f"tmp dir: {tmpdir}")
 
         print(f'Mining all relevant files from directory {input_path_obj.resolve()}...')
 
-        final_path = resolve_directory_output_path(input_path_obj, args.output)
+        # resolved once here; WriteOutputStep reports this same path
+        final_path = resolve_directory_output_path(input_path_obj, args.output).resolve()
 
-        print(f'output path: {final_path.resolve()}')
+        print(f'output path: {final_path}')
 
         steps = [
             GatherInputFilesStep(input_path_obj, include_subdirectories=recursive),
@@ -134,8 +151,7 @@ def process_script():
             DumpSentences("sentences.txt") if debug else None,
             NormalizeSentences(),
             DumpSentences("sentences-normalized.txt") if debug else None,
-            TokenizeStep(),
-            FilterFrequencyStep(min_frequency),
+            TokenizeStep(min_frequency=min_frequency),
             AddDefinitionsStep(debug=debug),
             ScoreWordStep(),
             AttachSentencesStep(),
@@ -144,7 +160,7 @@ def process_script():
         ]
 
         pipeline = Pipeline(steps=steps, on_progress=print_step_progress)
-        pipeline.run(Artifact(input_path, tmpdir=tmpdir))
+        pipeline.run(Artifact(input_path_obj, tmpdir=tmpdir))
 
     print(f'All tasks completed in {pipeline.duration:.1f} seconds.')
 
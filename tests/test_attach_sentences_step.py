@@ -5,7 +5,6 @@ from src.AttachSentencesStep import (
     MAX_SENTENCES,
     _compute_sentence_stats,
     _over_level_penalty,
-    _percentile,
     _sentence_dedupe_key,
     attach_sentences,
     sentence_quality_penalty,
@@ -42,10 +41,6 @@ class AttachSentencesStepTests(unittest.TestCase):
         self.assertEqual(mean, 200)
         self.assertEqual(variance, 10000)
 
-    def test_percentile_uses_sorted_values_and_caps_index(self):
-        self.assertEqual(_percentile([10, 30, 20], 0.9), 30)
-        self.assertEqual(_percentile([10, 30, 20], 0.0), 10)
-
     def test_over_level_penalty_is_quadratic_for_scores_above_target(self):
         self.assertEqual(_over_level_penalty([100, 150, 250], 150), 10000)
 
@@ -0,0 +1,91 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import src.steps.AddDefinitionsStep as definitions_step
+from src.steps.AddDefinitionsStep import (
+    add_and_filter_for_definitions,
+    load_definitions_cache,
+    save_definitions_cache,
+)
+from src.WordStats import WordStats
+
+
+class FakeJMDict:
+    def get_most_common_definition(self, word):
+        return {"猫": "cat"}.get(word)
+
+
+def stats(lemma):
+    return WordStats(0.0, 0, 1, 0.0, "", "", set(), [], lemma, ("名詞",), invalid=False)
+
+
+class DefinitionsCacheTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+
+        self.jmdict_path = self.root / "JMdict_e.xml"
+        self.jmdict_path.write_text("<JMdict/>", encoding="utf-8")
+        self.cache_path = self.root / "cache" / "definitions.pkl"
+
+        for patcher in (
+            patch.object(definitions_step, "JMDICT_PATH", self.jmdict_path),
+            patch.object(definitions_step, "_loaded_definitions", {}),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def reload(self) -> dict:
+        # forget the in-process copy so the next load reads the file
+        definitions_step._loaded_definitions.clear()
+        return load_definitions_cache(self.cache_path)
+
+    def test_definitions_round_trip_for_same_fingerprint(self):
+        save_definitions_cache(self.cache_path, {"猫": "cat", "謎語": None})
+
+        self.assertEqual(self.reload(), {"猫": "cat", "謎語": None})
+        self.assertEqual(list(self.cache_path.parent.glob("*.tmp")), [])
+
+    def test_definitions_are_dropped_when_jmdict_changes(self):
+        save_definitions_cache(self.cache_path, {"猫": "cat"})
+        self.jmdict_path.write_text("<JMdict></JMdict>", encoding="utf-8")
+
+        self.assertEqual(self.reload(), {})
+
+    def test_definitions_are_dropped_when_code_version_changes(self):
+        save_definitions_cache(self.cache_path, {"猫": "cat"})
+
+        with patch.object(definitions_step, "DEFINITIONS_VERSION", "defs-test"):
+            self.assertEqual(self.reload(), {})
+
+    def test_missing_cache_loads_empty(self):
+        self.assertEqual(self.reload(), {})
+
+    def test_new_definitions_are_checkpointed_every_interval(self):
+        saved = []
+
+        def record_save(path, definitions):
+            saved.append(len(definitions))
+            save_definitions_cache(path, definitions)
+
+        words = {w: stats(w) for w in ["猫", "犬", "鳥", "魚", "謎語"]}
+
+        with (
+            patch.object(definitions_step, "DEFINITIONS_CHECKPOINT_INTERVAL", 2),
+            patch.object(definitions_step, "get_jmdict", FakeJMDict),
+            patch.object(definitions_step, "save_definitions_cache", record_save),
+        ):
+            _, valid, invalid = add_and_filter_for_definitions(
+                words, lambda *a: None, None, cache_path=self.cache_path
+            )
+
+        self.assertEqual((valid, invalid), (1, 4))
+        self.assertEqual(saved, [2, 4, 5])
+        self.assertEqual(self.reload()["猫"], "cat")
+
+
+if __name__ == "__main__":
+    unittest.main()
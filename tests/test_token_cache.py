@@ -43,6 +43,27 @@ class TokenCacheTests(unittest.TestCase):
             self.assertIsNotNone(key)
             self.assertEqual(reloaded.load_by_hash(key)["tokens"], [{"surface": "猫"}])
 
+    def test_flush_waits_for_pending_payload_writes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = TokenCache(Path(tmp), "fingerprint")
+            key = cache.put("猫", [{"surface": "猫"}])
+            cache.flush_mtime_index()
+
+            self.assertTrue((Path(tmp) / f"{key}.pkl").exists())
+            self.assertEqual(list(Path(tmp).glob("*.tmp")), [])
+
+    def test_flush_shuts_down_the_writer_thread(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = TokenCache(Path(tmp), "fingerprint")
+            cache.put("猫", [{"surface": "猫"}])
+            cache.flush_mtime_index()
+
+            self.assertIsNone(cache._writer)
+
+            key = cache.put("犬", [{"surface": "犬"}])
+            self.assertEqual(cache.load_by_hash(key)["tokens"], [{"surface": "犬"}])
+            cache.flush_mtime_index()
+
     def test_load_by_hash_removes_bad_pickle_and_returns_none(self):
         with tempfile.TemporaryDirectory() as tmp:
             cache = TokenCache(Path(tmp), "fingerprint")
@@ -53,6 +74,26 @@ class TokenCacheTests(unittest.TestCase):
             self.assertIsNone(cache.load_by_hash(bad_key))
             self.assertFalse(bad_path.exists())
 
+    def test_load_by_hash_returns_none_for_missing_key(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = TokenCache(Path(tmp), "fingerprint")
+
+            self.assertIsNone(cache.load_by_hash("b" * 64))
+
+    def test_lemma_readings_round_trip_for_same_fingerprint(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            TokenCache(Path(tmp), "fingerprint").save_lemma_readings({"猫": "ねこ"})
+
+            reloaded = TokenCache(Path(tmp), "fingerprint")
+
+            self.assertEqual(reloaded.load_lemma_readings(), {"猫": "ねこ"})
+
+    def test_lemma_readings_are_dropped_when_fingerprint_changes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            TokenCache(Path(tmp), "old").save_lemma_readings({"猫": "ねこ"})
+
+            self.assertEqual(TokenCache(Path(tmp), "new").load_lemma_readings(), {})
+
 
 if __name__ == "__main__":
     unittest.main()
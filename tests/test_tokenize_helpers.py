@@ -1,6 +1,6 @@
 import unittest
 
-from src.TokenizeStep import (
+from src.steps.TokenizeStep import (
     SENT_BOUNDARY,
     build_sentence_candidates,
     clean_sentence_text,
@@ -18,13 +18,7 @@ from src.TokenizeStep import (
 )
 
 
-def token(lemma, pos=("名詞", "普通名詞", "一般", "*"), reading="ヨミ"):
-    return {
-        "base_form": lemma,
-        "lemma": lemma,
-        "reading": reading,
-        "pos": pos,
-    }
+NOUN = ("名詞", "普通名詞", "一般", "*")
 
 
 class TokenizeHelperTests(unittest.TestCase):
@@ -33,14 +27,14 @@ class TokenizeHelperTests(unittest.TestCase):
         self.assertIsNone(kata_to_hira(""))
 
     def test_is_useless_filters_function_words_and_proper_nouns(self):
-        self.assertTrue(is_useless(token("は", pos=("助詞", "係助詞", "*", "*"))))
-        self.assertTrue(is_useless(token("東京", pos=("名詞", "固有名詞", "地名", "*"))))
+        self.assertTrue(is_useless("は", ("助詞", "係助詞", "*", "*")))
+        self.assertTrue(is_useless("東京", ("名詞", "固有名詞", "地名", "*")))
 
     def test_is_useless_filters_noise_but_keeps_regular_japanese_words(self):
-        self.assertTrue(is_useless(token("あ")))
-        self.assertTrue(is_useless(token("スーパー")))
-        self.assertTrue(is_useless(token("言っ")))
-        self.assertFalse(is_useless(token("言葉")))
+        self.assertTrue(is_useless("あ", NOUN))
+        self.assertTrue(is_useless("スーパー", NOUN))
+        self.assertTrue(is_useless("言っ", NOUN))
+        self.assertFalse(is_useless("言葉", NOUN))
 
     def test_is_japanese_char_accepts_expected_sentence_characters(self):
         for ch in ["猫", "ね", "ネ", "A", "５", "。", "「"]: